@@ -77,7 +77,7 @@ class LegalDecisionAdmin(TranslatableAdmin):
     model = LegalDecision
     list_filter = (
         "decision_type",
-        "foi_court__jurisdiction",
+        "jurisdiction",
         ("foi_court", ForeignKeyFilter),
         make_nullfilter("ecli", _("Has ECLI")),
         make_emptyfilter("reference", _("Has reference")),
@@ -85,7 +85,7 @@ class LegalDecisionAdmin(TranslatableAdmin):
         make_emptyfilter("decision_type", _("Has decision type")),
         make_emptyfilter("translations__abstract", _("Has abstract")),
     )
-    list_display = ("reference", "court")
+    list_display = ("reference", "display_court", "display_date")
     search_fields = ["reference", "translations__court", "translations__abstract"]
     raw_id_fields = (
         "foi_lawsuit",
@@ -108,7 +108,13 @@ class LegalDecisionAdmin(TranslatableAdmin):
         return upload_urls + urls
 
     def update_search_index(self, request, queryset):
-        LegalDecision.objects.update_search_index(qs=queryset)
+        rows, elapsed = LegalDecision.objects.update_search_index(qs=queryset)
+        self.message_user(
+            request,
+            _(
+                "Updated the search index of {rows} translations in {elapsed:.2f}s."
+            ).format(rows=rows, elapsed=elapsed),
+        )
 
     def export_legal_decisions(self, request, queryset):
         all_objects = [
@@ -11,11 +11,71 @@ class FroideLegalActionConfig(AppConfig):
     verbose_name = _("Froide Legal Action App")
 
     def ready(self):
-        from .models import Proposal
-        from .signals import send_proposal_created_notification
+        from froide.document.models import Document
+        from froide.publicbody.models import FoiLaw, PublicBody
+
+        from .cache import bump_decision_generation
+        from .models import (
+            LegalDecision,
+            LegalDecisionTag,
+            LegalDecisionTagTranslation,
+            LegalDecisionTranslation,
+            Proposal,
+        )
+        from .signals import (
+            clear_court_jurisdiction,
+            mark_decision_search_index_dirty,
+            mark_decision_tags_search_index_dirty,
+            mark_tag_search_index_dirty,
+            mark_tag_translation_search_index_dirty,
+            mark_translation_search_index_dirty,
+            send_proposal_created_notification,
+            update_court_display_fields,
+            update_court_jurisdiction,
+            update_decision_laws_display_fields,
+            update_document_display_fields,
+            update_law_display_fields,
+        )
 
         signals.post_save.connect(send_proposal_created_notification, sender=Proposal)
 
+        signals.pre_save.connect(mark_decision_search_index_dirty, sender=LegalDecision)
+        signals.post_save.connect(
+            mark_translation_search_index_dirty, sender=LegalDecisionTranslation
+        )
+        signals.post_save.connect(
+            mark_tag_translation_search_index_dirty, sender=LegalDecisionTagTranslation
+        )
+        signals.pre_delete.connect(mark_tag_search_index_dirty, sender=LegalDecisionTag)
+        signals.m2m_changed.connect(
+            mark_decision_tags_search_index_dirty, sender=LegalDecision.tags.through
+        )
+
+        signals.m2m_changed.connect(
+            update_decision_laws_display_fields, sender=LegalDecision.foi_laws.through
+        )
+        # Deletions are handled before the relations are nulled or removed
+        for model, handler in (
+            (PublicBody, update_court_display_fields),
+            (FoiLaw, update_law_display_fields),
+            (Document, update_document_display_fields),
+        ):
+            signals.post_save.connect(handler, sender=model)
+            signals.pre_delete.connect(handler, sender=model)
+        signals.post_save.connect(update_court_jurisdiction, sender=PublicBody)
+        signals.pre_delete.connect(clear_court_jurisdiction, sender=PublicBody)
+
+        for model in (
+            LegalDecision,
+            LegalDecisionTranslation,
+            LegalDecisionTag,
+            LegalDecisionTagTranslation,
+        ):
+            signals.post_save.connect(bump_decision_generation, sender=model)
+            signals.post_delete.connect(bump_decision_generation, sender=model)
+        for through in (LegalDecision.tags.through, LegalDecision.foi_laws.through):
+            signals.m2m_changed.connect(bump_decision_generation, sender=through)
+
         from froide.account.export import registry
 
         registry.register(export_user_data)
@@ -0,0 +1,77 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+DECISION_GENERATION_KEY = "froide_legalaction:decision_generation"
+SEARCH_CACHE_TIMEOUT = 60 * 60
+FRAGMENT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def get_decision_generation():
+    """
+    Returns the current generation of the legal decision corpus.
+    Every change to decisions, their translations or tags starts a new
+    generation, so cache keys containing it never need to be deleted.
+    """
+    return cache.get_or_set(DECISION_GENERATION_KEY, time.time_ns, None)
+
+
+def get_decision_generation_time():
+    """
+    Returns the start of the current corpus generation as a datetime.
+    """
+    return datetime.fromtimestamp(get_decision_generation() / 1e9, tz=timezone.utc)
+
+
+def bump_decision_generation(**kwargs):
+    # A timestamp instead of incr() stays unique even if the key was evicted
+    cache.set(DECISION_GENERATION_KEY, time.time_ns(), None)
+
+
+def normalize_query(data, keys=None, fold_case=False):
+    """
+    Returns a sorted tuple of the non-empty (key, value) pairs in ``data``,
+    restricted to ``keys`` if given. Whitespace in values is collapsed and
+    with ``fold_case`` values are lower-cased.
+    """
+    items = []
+    for key in sorted(data.keys()):
+        if keys is not None and key not in keys:
+            continue
+        for value in sorted(data.getlist(key)):
+            value = " ".join(value.split())
+            if fold_case:
+                value = value.lower()
+            if value:
+                items.append((key, value))
+    return tuple(items)
+
+
+def make_cache_key(prefix, *parts):
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+    return "froide_legalaction:{}:{}:{}".format(
+        prefix, get_decision_generation(), digest
+    )
+
+
+def make_fragment_cache_key(prefix, obj, *parts):
+    """
+    Cache key of a fragment rendered for ``obj``. It contains the object's
+    ``updated_at`` instead of the corpus generation, so the entry outlives
+    changes to other decisions.
+    """
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+    return "froide_legalaction:{}:{}:{}:{}".format(
+        prefix, obj.pk, obj.updated_at.timestamp(), digest
+    )
+
+
+def make_stable_cache_key(prefix, *parts):
+    """
+    Cache key without the corpus generation, for entries whose ``parts``
+    already describe the state of the decisions they were built from.
+    """
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+    return "froide_legalaction:{}:{}".format(prefix, digest)
@@ -104,6 +104,25 @@ def parse_reference(reference):
     raise ValueError(f"Could not parse reference: {reference}")
 
 
+ECLI_PATTERN = re.compile(r"^ECLI:[A-Z]{2}:[A-Z0-9.]+:\d{4}:[A-Z0-9.]+$", re.IGNORECASE)
+
+
+def is_ecli(value):
+    return ECLI_PATTERN.match(value.strip()) is not None
+
+
+def make_reference_key(reference):
+    """
+    Normalize a reference for exact lookups:
+    "OVG 12 B 1.19" and "12 B 1/19" both become "12B1/19".
+    """
+    try:
+        reference = parse_reference(reference)
+    except ValueError:
+        pass
+    return re.sub(r"\s+", "", reference).upper()
+
+
 def guess_ecli_from_decision(decision):
     reference = parse_reference(decision.reference)
     return make_german_ecli(
@@ -0,0 +1,171 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import LegalDecision, LegalDecisionTranslation
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_CHUNK_SIZE = 1000
+TRANSLATION_FIELDS = (
+    "title",
+    "abstract",
+    "guiding_principle",
+    "fulltext",
+    "court",
+    "law",
+)
+CSV_FIELDS = (
+    "id",
+    "slug",
+    "url",
+    "reference",
+    "ecli",
+    "date",
+    "decision_type",
+    "outcome",
+    "source_url",
+    "foi_court",
+    "jurisdiction",
+    "laws",
+    "tags",
+    "created_at",
+    "updated_at",
+    "language",
+) + TRANSLATION_FIELDS
+
+
+def parse_since(value):
+    """
+    Parses the ``since`` parameter of incremental exports, an ISO 8601
+    date or datetime. Raises ValueError for anything else.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        since_date = parse_date(value)
+        if since_date is None:
+            raise ValueError("Invalid date: {}".format(value))
+        since = datetime.combine(since_date, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def get_export_queryset(since=None):
+    """
+    Decisions with everything the export contains, ordered by modification
+    so mirrors can continue from the last ``updated_at`` they have seen.
+    """
+    translations = LegalDecisionTranslation.objects.only(
+        "id", "master_id", "language_code", *TRANSLATION_FIELDS
+    )
+    qs = (
+        LegalDecision._base_manager.defer("source_data", "paragraphs")
+        .select_related("foi_court", "jurisdiction")
+        .prefetch_related(
+            Prefetch("translations", queryset=translations),
+            "tags__translations",
+            "foi_laws__translations",
+        )
+        .order_by("updated_at", "id")
+    )
+    if since is not None:
+        qs = qs.filter(updated_at__gte=since)
+    return qs
+
+
+def iter_decisions(since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the exported dict of every decision, modified at or after
+    ``since`` if given. Rows are fetched through a server-side cursor in
+    chunks of ``chunk_size`` with their relations prefetched per chunk,
+    so memory use doesn't grow with the number of decisions.
+    """
+    for decision in get_export_queryset(since=since).iterator(chunk_size=chunk_size):
+        yield serialize_decision(decision)
+
+
+def serialize_decision(decision):
+    court = decision.foi_court
+    return {
+        "id": decision.id,
+        "slug": decision.slug,
+        "url": settings.SITE_URL + decision.get_absolute_url(),
+        "reference": decision.reference,
+        "ecli": decision.ecli,
+        "date": decision.date,
+        "decision_type": decision.decision_type,
+        "outcome": decision.outcome,
+        "source_url": decision.source_url,
+        "court": {"id": court.id, "name": court.name} if court else None,
+        "jurisdiction": decision.jurisdiction.name if decision.jurisdiction else None,
+        "laws": [foi_law.name for foi_law in decision.foi_laws.all()],
+        "tags": [tag.name for tag in decision.tags.all()],
+        "created_at": decision.created_at,
+        "updated_at": decision.updated_at,
+        "translations": {
+            translation.language_code: {
+                field: getattr(translation, field) for field in TRANSLATION_FIELDS
+            }
+            for translation in decision.translations.all()
+        },
+    }
+
+
+def export_ndjson(decisions):
+    for decision in decisions:
+        yield json.dumps(decision, cls=DjangoJSONEncoder) + "\n"
+
+
+class Echo:
+    # csv.writer writes to a file, hand each row back instead
+    def write(self, value):
+        return value
+
+
+def export_csv(decisions):
+    """
+    Yields CSV lines with one row per translation of each decision.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_FIELDS)
+    for decision in decisions:
+        row = dict(
+            decision,
+            # The translations have a court column of their own
+            foi_court=decision["court"]["name"] if decision["court"] else "",
+            laws="; ".join(decision["laws"]),
+            tags="; ".join(decision["tags"]),
+        )
+        for language, translation in decision["translations"].items():
+            row.update(translation, language=language)
+            yield writer.writerow([encode_value(row[field]) for field in CSV_FIELDS])
+
+
+def encode_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+EXPORTERS = {
+    "ndjson": export_ndjson,
+    "csv": export_csv,
+}
+
+
+def export_decisions(export_format, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the lines of the export of decisions in ``export_format``.
+    """
+    return EXPORTERS[export_format](iter_decisions(since=since, chunk_size=chunk_size))
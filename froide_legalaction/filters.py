@@ -1,25 +1,63 @@
+import functools
+from datetime import date
+
 from django import forms
 from django.conf import settings
-from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count, F
-from django.db.models.functions import TruncYear
+from django.db import connection
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    Exists,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, ExtractYear, TruncYear
+from django.urls import reverse
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
-from django_filters import CharFilter, ChoiceFilter, FilterSet, ModelChoiceFilter
+from django_filters import (
+    CharFilter,
+    ChoiceFilter,
+    DateFilter,
+    FilterSet,
+    ModelMultipleChoiceFilter,
+    MultipleChoiceFilter,
+)
+
+from froide.publicbody.models import FoiLaw, Jurisdiction, PublicBody
 
-from froide.publicbody.models import FoiLaw, PublicBody
+from .decision_identifier import is_ecli, make_reference_key, parse_reference
+from .models import LegalDecision, LegalDecisionTag, LegalDecisionTagTranslation
+from .pagination import PAGE_PARAMETERS
+from .widgets import (
+    ExcludePageParameterLinkWidget,
+    FilterListWidget,
+    MultipleLinkWidget,
+)
 
-from .models import LegalDecision, LegalDecisionTag
-from .widgets import ExcludePageParameterLinkWidget, FilterListWidget
+# Number of facet values rendered with the list, the others are
+# searched and paged through the facet search endpoint
+FACET_LIMIT = 20
+# Name prefix of the CTEs holding the ids of the decisions facets count
+FACET_IDS_CTE = "legaldecision_facet_ids"
 
 
 def get_foi_courts():
     return PublicBody.objects.exclude(pb_legaldecisions=None)
 
 
+def get_jurisdictions():
+    return Jurisdiction.objects.exclude(legal_decisions=None)
+
+
 def get_foi_law_types():
     foilaw_types = (
         FoiLaw.objects.exclude(legal_decisions=None)
@@ -49,6 +87,12 @@ def get_types_for_choices():
     return LegalDecision.LegalDecisionTypes.choices
 
 
+MATCH_CHOICES = (
+    ("any", _("any selected")),
+    ("all", _("all selected")),
+)
+
+
 class LegalDecisionFilterSet(FilterSet):
     quick_search = CharFilter(
         method="get_quick_search",
@@ -61,34 +105,65 @@ class LegalDecisionFilterSet(FilterSet):
         ),
         help_text="",
     )
-    tags = ModelChoiceFilter(
+    tags = ModelMultipleChoiceFilter(
         queryset=LegalDecisionTag.objects.all().order_by("translations__name"),
+        method="filter_tags",
         widget=FilterListWidget,
         label=_("by tags"),
     )
 
-    foi_court = ModelChoiceFilter(
+    foi_court = ModelMultipleChoiceFilter(
         queryset=get_foi_courts(),
+        method="filter_courts",
         widget=FilterListWidget,
         label=_("by Court"),
     )
-    foi_laws__law_type = ChoiceFilter(
+    jurisdiction = ModelMultipleChoiceFilter(
+        queryset=get_jurisdictions(),
+        method="filter_jurisdictions",
+        widget=MultipleLinkWidget,
+        label=_("by Jurisdiction"),
+    )
+    foi_laws__law_type = MultipleChoiceFilter(
         choices=get_foi_law_types,
-        widget=ExcludePageParameterLinkWidget,
+        method="filter_law_types",
+        widget=MultipleLinkWidget,
         label=_("by Law Type"),
-        lookup_expr="iexact",
     )
     decision_type = ChoiceFilter(
         choices=get_types_for_choices,
         widget=ExcludePageParameterLinkWidget,
         label=_("by Type"),
     )
-    date = ChoiceFilter(
+    date = MultipleChoiceFilter(
         choices=get_years_for_choices,
-        lookup_expr="year",
+        method="filter_years",
         widget=FilterListWidget,
         label=_("by Year"),
     )
+    date_from = DateFilter(
+        field_name="date",
+        lookup_expr="gte",
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "form-control form-control-sm"}
+        ),
+        label=_("Decided from"),
+    )
+    date_to = DateFilter(
+        field_name="date",
+        lookup_expr="lte",
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "form-control form-control-sm"}
+        ),
+        label=_("Decided until"),
+    )
+    match = ChoiceFilter(
+        choices=MATCH_CHOICES,
+        method="filter_match",
+        widget=ExcludePageParameterLinkWidget,
+        label=_("Match tags and laws"),
+        empty_label=None,
+    )
 
     class Meta:
         model = LegalDecision
@@ -97,8 +172,12 @@ class LegalDecisionFilterSet(FilterSet):
             "tags",
             "foi_laws__law_type",
             "foi_court",
+            "jurisdiction",
             "decision_type",
             "date",
+            "date_from",
+            "date_to",
+            "match",
         )
 
     def __init__(self, *args, **kwargs):
@@ -108,53 +187,370 @@ class LegalDecisionFilterSet(FilterSet):
             self.language = request.LANGUAGE_CODE
         else:
             self.language = settings.LANGUAGE_CODE
+        # Resolve callable choices at most once per filterset, they are
+        # used by form validation, the widgets and the selected filters
+        for filter in self.filters.values():
+            choices = filter.extra.get("choices")
+            if callable(choices):
+                filter.extra["choices"] = functools.cache(choices)
 
     def get_quick_search(self, queryset, name, value):
-        query_language = LegalDecision.objects.get_search_lang(self.language)
-        query = SearchQuery(value, config=query_language)
+        identifier_qs = self.get_identifier_search(queryset, value)
+        if identifier_qs is not None and identifier_qs.exists():
+            return identifier_qs
+        fulltext_qs = self.get_fulltext_search(queryset, value)
+        if fulltext_qs.exists():
+            return fulltext_qs
+        return self.get_fuzzy_search(queryset, value)
+
+    def match_all(self):
+        return self.form.cleaned_data.get("match") == "all"
+
+    def filter_related(self, queryset, related, values):
+        """
+        Filters by a correlated EXISTS subquery on ``related`` rows per
+        decision instead of joining them, so decisions are never repeated.
+        Decisions match any of ``values`` or, with ``match=all``, all of
+        them. ``related`` maps a value to a queryset of related rows.
+        """
+        if not values:
+            return queryset
+        if self.match_all():
+            for value in values:
+                queryset = queryset.filter(Exists(related([value])))
+            return queryset
+        return queryset.filter(Exists(related(values)))
+
+    def filter_tags(self, queryset, name, value):
+        def related(tags):
+            return LegalDecision.tags.through.objects.filter(
+                legaldecision=OuterRef("pk"), legaldecisiontag__in=tags
+            )
+
+        return self.filter_related(queryset, related, list(value))
+
+    def filter_law_types(self, queryset, name, value):
+        def related(law_types):
+            return LegalDecision.foi_laws.through.objects.filter(
+                legaldecision=OuterRef("pk"), foilaw__law_type__in=law_types
+            )
+
+        return self.filter_related(queryset, related, value)
+
+    def filter_courts(self, queryset, name, value):
+        # A decision has one court, the foreign key column needs no subquery
+        if not value:
+            return queryset
+        return queryset.filter(foi_court__in=value)
+
+    def filter_jurisdictions(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(jurisdiction__in=value)
+
+    def filter_years(self, queryset, name, value):
+        # Ranges on the date column instead of extracting the year,
+        # so the date index can be used
+        if not value:
+            return queryset
+        years = Q()
+        for year in map(int, value):
+            years |= Q(date__gte=date(year, 1, 1), date__lt=date(year + 1, 1, 1))
+        return queryset.filter(years)
+
+    def filter_match(self, queryset, name, value):
+        # Read by the tag and law type filters
+        return queryset
+
+    def get_identifier_search(self, queryset, value):
+        """
+        Exact lookup for input shaped like an ECLI or a reference.
+        Returns None if the input looks like neither.
+        """
+        if is_ecli(value):
+            return queryset.filter(ecli__iexact=value.strip())
+        try:
+            parse_reference(value)
+        except ValueError:
+            return None
+        return queryset.filter(reference_key=make_reference_key(value))
+
+    def get_fulltext_search(self, queryset, value):
+        return LegalDecision.objects.search(queryset, value, self.language)
+
+    def get_fuzzy_search(self, queryset, value):
+        matches = LegalDecision.objects.fuzzy_search(value, self.language)
         return (
-            queryset.filter(translations__search_vector=query)
-            .annotate(rank=SearchRank(F("translations__search_vector"), query))
+            queryset.filter(pk__in=[pk for pk, _similarity in matches])
+            .annotate(
+                rank=Case(
+                    *[
+                        When(pk=pk, then=Value(similarity))
+                        for pk, similarity in matches
+                    ],
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+            )
             .order_by("-rank")
         )
 
-    def get_filter_url(self, clear_field=None):
+    def get_matching_paragraphs(self, ids):
+        """
+        Maps the decisions in ``ids`` to the anchor of their paragraph
+        best matching the quick search, if any.
+        """
+        value = self.form.cleaned_data.get("quick_search") if self.is_valid() else None
+        if not value or not ids:
+            return {}
+        return LegalDecision.objects.get_matching_paragraphs(ids, value, self.language)
+
+    def get_facet_expressions(self):
+        """
+        Maps facet filter names to the value and label expressions
+        their counts are grouped by. An empty label is filled in later.
+        """
+        tag_name = (
+            LegalDecisionTagTranslation.objects.filter(master=OuterRef("tags"))
+            .order_by(Case(When(language_code=self.language, then=0), default=1))
+            .values("name")[:1]
+        )
+        return {
+            "tags": ("tags", Subquery(tag_name)),
+            "foi_court": ("foi_court", "foi_court__name"),
+            "jurisdiction": ("jurisdiction", "jurisdiction__name"),
+            "foi_laws__law_type": ("foi_laws__law_type", Value("")),
+            "decision_type": ("decision_type", Value("")),
+            "date": (ExtractYear("date"), Value("")),
+        }
+
+    def get_facet_queryset(self, name):
+        """
+        The decisions the values of facet ``name`` are counted in: the
+        result filtered by every filter but the facet's own, so values
+        besides the selected ones can still be added to the selection.
+        """
+        self.is_valid()
+        if not self.form.cleaned_data.get(name):
+            return self.qs
+        queryset = self.queryset.all()
+        for filter_name, value in self.form.cleaned_data.items():
+            if filter_name != name:
+                queryset = self.filters[filter_name].filter(queryset, value)
+        return queryset
+
+    def get_facet_query(self):
+        """
+        Returns SQL and params counting the decisions per value of every
+        facet filter in (facet, value, label, count) rows. The decision ids
+        each facet is counted in are materialized once in a CTE, shared by
+        all facets without a selection of their own, so the search runs
+        only once per distinct set of filters.
+        """
+        ctes = []
+        queries = []
+        for name, (value, label) in self.get_facet_expressions().items():
+            queryset = self.get_facet_queryset(name)
+            cte_name = FACET_IDS_CTE
+            if queryset is not self.qs:
+                cte_name = "{}_{}".format(FACET_IDS_CTE, len(ctes))
+            if cte_name not in dict(ctes):
+                ctes.append(
+                    (cte_name, queryset.order_by().values("pk").query.sql_with_params())
+                )
+            queries.append(
+                LegalDecision._base_manager.filter(
+                    pk__in=RawSQL("SELECT id FROM {}".format(cte_name), ())
+                )
+                .values(
+                    facet_value=Cast(value, output_field=CharField()),
+                    facet_label=Cast(label, output_field=CharField()),
+                )
+                .annotate(facet=Value(name), count=Count("pk", distinct=True))
+                .values_list("facet", "facet_value", "facet_label", "count")
+                .order_by()
+            )
+        sql, params = queries[0].union(*queries[1:], all=True).query.sql_with_params()
+        cte_params = []
+        for _cte_name, (_cte_sql, ids_params) in ctes:
+            cte_params.extend(ids_params)
+        return (
+            "WITH {} {}".format(
+                ", ".join(
+                    "{} (id) AS MATERIALIZED ({})".format(cte_name, ids_sql)
+                    for cte_name, (ids_sql, _ids_params) in ctes
+                ),
+                sql,
+            ),
+            tuple(cte_params) + tuple(params),
+        )
+
+    def get_facets(self):
+        """
+        Returns a dict of facet filter name to a list of (value, label, count)
+        tuples for the values present in the result of the other filters.
+        """
+        facets = {name: [] for name in self.get_facet_expressions()}
+        with connection.cursor() as cursor:
+            cursor.execute(*self.get_facet_query())
+            rows = cursor.fetchall()
+        for name, value, label, count in rows:
+            if not value:
+                continue
+            label = label or self.get_facet_label(name, value)
+            facets[name].append((value, label, count))
+        for name, values in facets.items():
+            if name == "date":
+                values.sort(reverse=True)
+            else:
+                values.sort(key=lambda facet: str(facet[1]).lower())
+        return facets
+
+    def search_facet(self, name, query="", page=1, per_page=FACET_LIMIT):
+        """
+        Returns a page of (value, label, count) tuples of the facet ``name``
+        in the result of the other filters whose value or label contains ``query``,
+        most frequent first, and whether more pages follow.
+        """
+        value, label = self.get_facet_expressions()[name]
+        rows = (
+            LegalDecision._base_manager.filter(
+                pk__in=self.get_facet_queryset(name).order_by().values("pk")
+            )
+            .values(
+                facet_value=Cast(value, output_field=CharField()),
+                facet_label=Cast(label, output_field=CharField()),
+            )
+            .annotate(count=Count("pk", distinct=True))
+            .filter(facet_value__isnull=False)
+        )
+        if query:
+            rows = rows.filter(
+                Q(facet_value__icontains=query) | Q(facet_label__icontains=query)
+            )
+        start = (page - 1) * per_page
+        rows = list(
+            rows.order_by("-count", "facet_value").values_list(
+                "facet_value", "facet_label", "count"
+            )[start : start + per_page + 1]
+        )
+        values = [
+            (value, label or self.get_facet_label(name, value), count)
+            for value, label, count in rows[:per_page]
+        ]
+        return values, len(rows) > per_page
+
+    def get_facet_label(self, name, value):
+        if name == "decision_type":
+            return dict(get_types_for_choices()).get(value, value)
+        return value
+
+    def apply_facets(self, facets, limit=None):
+        """
+        Replaces the choices rendered by the facet widgets with the values
+        present in the result of the other filters, labelled with their
+        counts.
+        Facets without any values are removed from the form. Facets with
+        more than ``limit`` values only keep the most frequent ones and
+        the selected one, the others are left to the facet search.
+        """
+        for name, values in facets.items():
+            if not values:
+                del self.form.fields[name]
+                continue
+            field = self.form.fields[name]
+            if limit is not None and len(values) > limit:
+                values = self.get_top_facet_values(name, values, limit)
+                field.widget.search_url = "{}?{}".format(
+                    reverse("legaldecision:facet-search", kwargs={"name": name}),
+                    self.get_filter_url(),
+                )
+            # Multiple choice fields have no empty label of their own
+            reset_label = getattr(field, "empty_label", None) or _("All")
+            field.widget.choices = [("", reset_label)] + [
+                (value, "{} ({})".format(label, count))
+                for value, label, count in values
+            ]
+
+    def get_top_facet_values(self, name, values, limit):
+        selected = set(self.data.getlist(name))
+        top = sorted(values, key=lambda facet: facet[2], reverse=True)[:limit]
+        return [facet for facet in values if facet in top or facet[0] in selected]
+
+    def get_query_items(self, exclude=()):
+        """
+        Returns the (name, value) pairs of the current query without page
+        parameters and ``exclude``, e.g. for hidden fields of a form
+        changing only some filters.
+        """
+        return [
+            (name, value)
+            for name, values in self.data.lists()
+            if name not in PAGE_PARAMETERS and name not in exclude
+            for value in values
+        ]
+
+    def get_option_values(self, name, value):
+        """
+        Values of ``name`` selected by a link to ``value``, which multiple
+        choice filters add to the selected ones.
+        """
+        if not isinstance(self.filters[name], MultipleChoiceFilter):
+            return [value]
+        selected = self.data.getlist(name)
+        return selected if value in selected else selected + [value]
+
+    def get_filter_url(self, clear_field=None, clear_value=None):
         data = self.data.copy()
-        if "page" in data:
-            del data["page"]
-        if clear_field:
-            del data[clear_field]
+        for parameter in PAGE_PARAMETERS:
+            data.pop(parameter, None)
+        if clear_field and clear_value is not None:
+            data.setlist(
+                clear_field,
+                [value for value in data.getlist(clear_field) if value != clear_value],
+            )
+        elif clear_field:
+            data.pop(clear_field, None)
         try:
             url = data.urlencode()
         except AttributeError:
             url = urlencode(data)
         return mark_safe("%(query_string)s" % {"query_string": url})
 
-    def get_selected_choice_value(self, filter, value):
+    def get_selected_choice_value(self, filter, value, clear_value=None):
         func = filter.extra.get("choices")
         filter_name = filter.field_name
         if func:
-            choices = func()
+            choices = func() if callable(func) else func
             for choice in choices:
                 if value == str(choice[0]):
-                    url = self.get_filter_url(clear_field=filter_name)
+                    url = self.get_filter_url(
+                        clear_field=filter_name, clear_value=clear_value
+                    )
                     return (choice[1], url)
         return (value, "")
 
-    def get_selected_model_choice_value(self, filter, value):
-        qs = filter.extra.get("queryset")
-        try:
-            element = qs.get(id=value)
-            filter_name = filter.field_name
-            return (str(element), self.get_filter_url(clear_field=filter_name))
-        except (ValueError, ObjectDoesNotExist):
-            return (value, "")
+    def get_selected_model_choice_values(self, filter):
+        # The instances were fetched when the form was validated, which the
+        # list view does before facets remove fields from the form
+        if not hasattr(self.form, "cleaned_data"):
+            self.is_valid()
+        elements = self.form.cleaned_data.get(filter.field_name) or []
+        return [
+            (
+                str(element),
+                self.get_filter_url(
+                    clear_field=filter.field_name, clear_value=str(element.pk)
+                ),
+            )
+            for element in elements
+        ]
 
     def get_selected_filters(self):
         res = []
         data = self.data.copy()
-        if "page" in data:
-            del data["page"]
+        for parameter in PAGE_PARAMETERS:
+            data.pop(parameter, None)
         for key in data.keys():
             filter = self.filters.get(key)
             value = data.get(key)
@@ -162,8 +558,14 @@ class LegalDecisionFilterSet(FilterSet):
             if filter and value:
                 if filter_type == "ChoiceFilter":
                     res.append(self.get_selected_choice_value(filter, value))
-                elif filter_type == "ModelChoiceFilter":
-                    res.append(self.get_selected_model_choice_value(filter, value))
+                elif filter_type == "MultipleChoiceFilter":
+                    res.extend(
+                        self.get_selected_choice_value(filter, value, clear_value=value)
+                        for value in data.getlist(key)
+                        if value
+                    )
+                elif filter_type == "ModelMultipleChoiceFilter":
+                    res.extend(self.get_selected_model_choice_values(filter))
                 else:
                     res.append((value, self.get_filter_url(clear_field=key)))
         return res
@@ -0,0 +1,149 @@
+import functools
+import html
+import re
+from html.parser import HTMLParser
+
+from django.template import engines
+from django.utils.html import strip_tags
+from django.utils.text import slugify
+
+HEADING_PATTERN = re.compile(r"<h([23])(?:\s[^>]*)?>(.*?)</h\1>", re.DOTALL)
+VOID_ELEMENTS = frozenset(
+    ("area", "br", "col", "embed", "hr", "img", "input", "link", "meta", "wbr")
+)
+
+
+class TopLevelElementParser(HTMLParser):
+    """
+    Collects the start and end offsets of the top level elements of an
+    HTML fragment.
+    """
+
+    def __init__(self, text):
+        super().__init__(convert_charrefs=False)
+        self.text = text
+        self.line_offsets = [0] + [match.end() for match in re.finditer("\n", text)]
+        self.depth = 0
+        self.start = None
+        self.spans = []
+
+    def get_offset(self):
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            self.handle_startendtag(tag, attrs)
+            return
+        if self.depth == 0:
+            self.start = self.get_offset()
+        self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth == 0:
+            start = self.get_offset()
+            self.spans.append((start, start + len(self.get_starttag_text())))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS or self.depth == 0:
+            return
+        self.depth -= 1
+        if self.depth == 0:
+            end = self.text.index(">", self.get_offset()) + 1
+            self.spans.append((self.start, end))
+
+
+def split_elements(text):
+    """
+    Splits an HTML fragment into its top level elements. Text between
+    them is kept as an element of its own.
+    """
+    parser = TopLevelElementParser(text)
+    parser.feed(text)
+    parser.close()
+    if parser.depth:
+        parser.spans.append((parser.start, len(text)))
+    elements = []
+    position = 0
+    for start, end in parser.spans:
+        elements.append(text[position:start].strip())
+        elements.append(text[start:end])
+        position = end
+    elements.append(text[position:].strip())
+    return [element for element in elements if element]
+
+
+@functools.cache
+def get_markdown_template():
+    return engines["django"].from_string("{% load markup %}{{ text|markdown }}")
+
+
+def render_markdown(text):
+    return get_markdown_template().render({"text": text})
+
+
+def make_heading(match, anchors, position):
+    level, content = match.groups()
+    title = html.unescape(strip_tags(content)).strip()
+    base = "section-{}".format(slugify(title) or position + 1)
+    anchor = base
+    suffix = 2
+    while anchor in anchors:
+        anchor = "{}-{}".format(base, suffix)
+        suffix += 1
+    anchors.add(anchor)
+    return {"id": anchor, "title": title, "level": int(level)}
+
+
+def split_fulltext(text):
+    """
+    Renders the markdown full text of a decision and splits the HTML into
+    paragraphs at its top level elements, so lists, code blocks and
+    footnotes stay intact. A heading starts a new section, like the
+    ``## Tenor`` and ``## Tatbestand`` sections of imported decisions, and
+    is anchored by its title. Other paragraphs get an anchor from their
+    position. Returns a list of dicts with position, section, anchor, html,
+    text and headings.
+    """
+    paragraphs = []
+    anchors = set()
+    section = 0
+    for element in split_elements(render_markdown(text or "")):
+        match = HEADING_PATTERN.fullmatch(element)
+        if match:
+            heading = make_heading(match, anchors, len(paragraphs))
+            headings = [heading]
+            section += 1
+            anchor = heading["id"]
+            element_html = '<h{0} id="{1}">{2}</h{0}>'.format(
+                heading["level"], anchor, match.group(2)
+            )
+        else:
+            headings = []
+            anchor = "p-{}".format(len(paragraphs) + 1)
+            element_html = '<div id="{}">{}</div>'.format(anchor, element)
+        paragraphs.append(
+            {
+                "position": len(paragraphs),
+                "section": section,
+                "anchor": anchor,
+                "html": element_html,
+                "text": html.unescape(strip_tags(element_html)).strip(),
+                "headings": headings,
+            }
+        )
+    return paragraphs
+
+
+def join_fulltext(paragraphs):
+    """
+    Returns the HTML of the paragraphs from ``split_fulltext`` and the
+    table of contents as a list of dicts with the anchor id, title,
+    heading level and section of every heading.
+    """
+    toc = [
+        dict(heading, section=paragraph["section"])
+        for paragraph in paragraphs
+        for heading in paragraph["headings"]
+    ]
+    return "".join(paragraph["html"] for paragraph in paragraphs), toc
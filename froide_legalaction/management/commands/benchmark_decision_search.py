@@ -0,0 +1,192 @@
+import random
+import re
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import translation
+from django.utils.text import slugify
+
+from ...filters import LegalDecisionFilterSet
+from ...models import LegalDecision, LegalDecisionTag, LegalDecisionTranslation
+from ...pagination import KeysetPaginator
+
+EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+WORDS = (
+    "Informationsfreiheit Akteneinsicht Auskunft Behörde Bescheid Widerspruch "
+    "Klage Verwaltungsgericht Umweltinformation Verbraucherinformation "
+    "Geschäftsgeheimnis Betriebsgeheimnis personenbezogene Daten Datenschutz "
+    "Abwägung Interesse Ausschlussgrund Vertraulichkeit Beratung Gebühren "
+    "Kosten Berufung Revision Beschluss Urteil Anspruch Antrag Ablehnung "
+    "Schwärzung Unterlagen Vertrag Gutachten Protokoll Sitzung Ministerium "
+    "Landesamt Bundesamt Kommune Polizei Staatsanwaltschaft Presse Rundfunk "
+    "Transparenz Öffentlichkeit Verfahren Rechtsweg Zuständigkeit Frist"
+).split()
+
+DECISION_TYPES = [choice for choice, _label in LegalDecision.LegalDecisionTypes.choices]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic legal decision corpus and reports EXPLAIN ANALYZE "
+        "timings of the legal decision search. Rolled back unless --keep is given."
+    )
+    scenarios = ("quick_search", "facets", "pagination", "multi_select")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--language", default=settings.LANGUAGE_CODE)
+        parser.add_argument("--query", default="Akteneinsicht Geschäftsgeheimnis")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=self.scenarios,
+            help="Scenario to run, can be given multiple times (default: all)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the synthetic corpus instead of rolling back",
+        )
+
+    def handle(self, *args, **options):
+        translation.activate(options["language"])
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        with transaction.atomic():
+            self.seed_corpus()
+            for scenario in options["scenario"] or self.scenarios:
+                getattr(self, "benchmark_{}".format(scenario))()
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    def make_text(self, word_count):
+        return " ".join(self.rng.choice(WORDS) for _i in range(word_count))
+
+    def seed_corpus(self):
+        start = time.monotonic()
+        count = self.options["count"]
+        decisions = LegalDecision._base_manager.bulk_create(
+            [
+                LegalDecision(
+                    reference="{} K {}/{}".format(
+                        self.rng.randint(1, 40), i, self.rng.randint(10, 24)
+                    ),
+                    date=date(2000, 1, 1) + timedelta(days=self.rng.randint(0, 9000)),
+                    decision_type=self.rng.choice(DECISION_TYPES),
+                    search_index_dirty=False,
+                )
+                for i in range(count)
+            ],
+            batch_size=5000,
+        )
+        LegalDecisionTranslation.objects.bulk_create(
+            [
+                LegalDecisionTranslation(
+                    master=decision,
+                    language_code=self.options["language"],
+                    title=self.make_text(8),
+                    abstract=self.make_text(60),
+                    fulltext=self.make_text(400),
+                )
+                for decision in decisions
+            ],
+            batch_size=2000,
+        )
+        self.tags = [
+            LegalDecisionTag.objects.create(name=word, slug=slugify(word))
+            for word in WORDS[:30]
+        ]
+        DecisionTag = LegalDecision.tags.through
+        DecisionTag.objects.bulk_create(
+            [
+                DecisionTag(legaldecision_id=decision.id, legaldecisiontag_id=tag.id)
+                for decision in decisions
+                for tag in self.rng.sample(self.tags, self.rng.randint(1, 3))
+            ],
+            batch_size=5000,
+        )
+        synthetic = LegalDecision.objects.filter(id__gte=decisions[0].id)
+        rows, elapsed = LegalDecision.objects.rebuild_search_index(qs=synthetic)
+        with connection.cursor() as cursor:
+            for model in (LegalDecision, LegalDecisionTranslation, DecisionTag):
+                cursor.execute("ANALYZE {}".format(model._meta.db_table))
+        self.stdout.write(
+            "Seeded {} decisions in {:.2f}s (search index: {} rows in {:.2f}s)".format(
+                count, time.monotonic() - start, rows, elapsed
+            )
+        )
+
+    def get_filterset(self, data):
+        request = RequestFactory().get("/", data)
+        request.LANGUAGE_CODE = self.options["language"]
+        return LegalDecisionFilterSet(
+            request.GET, queryset=LegalDecision.objects.all(), request=request
+        )
+
+    def explain(self, label, qs):
+        self.report(label, lambda: qs.explain(analyze=True, buffers=True))
+
+    def explain_sql(self, label, sql, params):
+        def explain():
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, params)
+                return "\n".join(row[0] for row in cursor.fetchall())
+
+        self.report(label, explain)
+
+    def report(self, label, explain):
+        timings = []
+        for _i in range(self.options["repeat"]):
+            plan = explain()
+            timings.append(float(EXECUTION_TIME.search(plan).group(1)))
+        self.stdout.write("== {}".format(label))
+        self.stdout.write(plan)
+        self.stdout.write(
+            "{}: min {:.2f} ms, median {:.2f} ms over {} runs\n".format(
+                label, min(timings), statistics.median(timings), len(timings)
+            )
+        )
+
+    def benchmark_quick_search(self):
+        f = self.get_filterset({"quick_search": self.options["query"]})
+        self.explain("quick_search", f.qs[:10])
+
+    def benchmark_facets(self):
+        f = self.get_filterset({"quick_search": self.options["query"]})
+        self.explain_sql("facets", *f.get_facet_query())
+
+    def benchmark_pagination(self):
+        paginator = KeysetPaginator(LegalDecision.objects.all(), 10)
+        rows = LegalDecision.objects.values_list("id", "date").order_by(
+            *paginator.get_ordering()
+        )
+        offset = self.options["count"] // 2
+        self.explain("offset_page", rows[offset : offset + 10])
+        pk, value = rows[offset - 1]
+        self.explain(
+            "keyset_page",
+            rows.filter(paginator.get_seek_filter(value, pk))[:10],
+        )
+
+    def benchmark_multi_select(self):
+        tag_ids = [tag.id for tag in self.tags[:3]]
+        decisions = LegalDecision.objects.order_by("-date")
+        self.explain(
+            "tags_any_join", decisions.filter(tags__in=tag_ids).distinct()[:10]
+        )
+        f = self.get_filterset({"tags": tag_ids})
+        self.explain("tags_any_exists", f.qs.order_by("-date")[:10])
+        joined = decisions
+        for tag_id in tag_ids[:2]:
+            joined = joined.filter(tags=tag_id)
+        self.explain("tags_all_join", joined[:10])
+        f = self.get_filterset({"tags": tag_ids[:2], "match": "all"})
+        self.explain("tags_all_exists", f.qs.order_by("-date")[:10])
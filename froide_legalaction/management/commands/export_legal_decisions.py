@@ -0,0 +1,48 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_decisions, parse_since
+
+
+class Command(BaseCommand):
+    help = "Exports legal decisions with their translations as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument(
+            "--since",
+            help="Only export decisions modified at or after this ISO date or time",
+        )
+        parser.add_argument(
+            "--output", help="File to write the export to (default: stdout)"
+        )
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        since = None
+        if options["since"]:
+            try:
+                since = parse_since(options["since"])
+            except ValueError as e:
+                raise CommandError(str(e)) from e
+        lines = export_decisions(
+            options["format"], since=since, chunk_size=options["chunk_size"]
+        )
+        output = sys.stdout
+        if options["output"]:
+            output = open(options["output"], "w", newline="")
+        count = 0
+        try:
+            for line in lines:
+                output.write(line)
+                count += 1
+        finally:
+            if options["output"]:
+                output.close()
+        # Keep stdout clean for the export itself
+        self.stderr.write(
+            "Exported {} lines in {:.2f}s".format(count, time.monotonic() - start)
+        )
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...models import LegalDecision
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-renders the stored full text HTML and paragraph index "
+        "of legal decisions in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "ids", nargs="*", type=int, help="Only render decisions with these ids"
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        qs = None
+        if options["ids"]:
+            qs = LegalDecision.objects.filter(id__in=options["ids"])
+        rows = LegalDecision.objects.update_fulltext_html(
+            qs=qs, batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            "Rendered full text of {} translations in {:.2f}s".format(
+                rows, time.monotonic() - start
+            )
+        )
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...models import LegalDecision
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored display strings of legal decisions in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "ids", nargs="*", type=int, help="Only update decisions with these ids"
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        qs = None
+        if options["ids"]:
+            qs = LegalDecision.objects.filter(id__in=options["ids"])
+        rows = LegalDecision.objects.update_display_fields(
+            qs=qs, batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            "Updated display fields of {} translations in {:.2f}s".format(
+                rows, time.monotonic() - start
+            )
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ...models import LegalDecision
+
+
+class Command(BaseCommand):
+    help = "Rebuilds search text and search vectors of legal decisions in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "ids", nargs="*", type=int, help="Only reindex decisions with these ids"
+        )
+        parser.add_argument(
+            "--dirty",
+            action="store_true",
+            help="Only reindex decisions that changed since their last indexing",
+        )
+
+    def handle(self, *args, **options):
+        if options["dirty"]:
+            rows, elapsed = LegalDecision.objects.update_dirty_search_index()
+        else:
+            qs = None
+            if options["ids"]:
+                qs = LegalDecision.objects.filter(id__in=options["ids"])
+            rows, elapsed = LegalDecision.objects.rebuild_search_index(qs=qs)
+        self.stdout.write(
+            "Rebuilt search index of {} translations in {:.2f}s".format(rows, elapsed)
+        )
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "froide_legalaction",
+            "0027_legaldecision_created_at_legaldecision_created_by_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldecision",
+            name="search_index_dirty",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="legaldecision",
+            index=models.Index(
+                condition=models.Q(("search_index_dirty", True)),
+                fields=["id"],
+                name="legaldecision_search_dirty",
+            ),
+        ),
+    ]
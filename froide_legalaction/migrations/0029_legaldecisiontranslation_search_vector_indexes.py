@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:40
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0028_legaldecision_search_index_dirty"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="legaldecisiontranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("language_code", "de")),
+                fields=["search_vector"],
+                name="legaldecision_search_de",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="legaldecisiontranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("language_code", "en")),
+                fields=["search_vector"],
+                name="legaldecision_search_en",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:05
+
+from django.db import migrations
+
+
+def mark_search_index_dirty(apps, schema_editor):
+    # search vectors are now weighted per field and need to be rebuilt
+    LegalDecision = apps.get_model("froide_legalaction", "LegalDecision")
+    LegalDecision.objects.update(search_index_dirty=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0029_legaldecisiontranslation_search_vector_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_search_index_dirty, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+from froide_legalaction.decision_identifier import make_reference_key
+
+
+def populate_reference_key(apps, schema_editor):
+    LegalDecision = apps.get_model("froide_legalaction", "LegalDecision")
+    decisions = []
+    for decision in LegalDecision.objects.only("id", "reference").iterator():
+        decision.reference_key = make_reference_key(decision.reference)
+        decisions.append(decision)
+    LegalDecision.objects.bulk_update(decisions, ["reference_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0030_reindex_weighted_search_vectors"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldecision",
+            name="reference_key",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=200
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="legaldecision",
+            index=models.Index(
+                django.db.models.functions.text.Upper("ecli"),
+                name="legaldecision_ecli_upper",
+            ),
+        ),
+        migrations.RunPython(populate_reference_key, migrations.RunPython.noop),
+    ]
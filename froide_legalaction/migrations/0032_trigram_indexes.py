@@ -0,0 +1,47 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:20
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0031_legaldecision_reference_key"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="legaldecision",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["reference"],
+                name="legaldecision_reference_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="legaldecision",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["ecli"],
+                name="legaldecision_ecli_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="legaldecisiontranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="legaldecision_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="legaldecisiontranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["court"],
+                name="legaldecision_court_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:05
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0032_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="legaldecisiontranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("language_code__in", ["de", "en"]), _negated=True),
+                fields=["search_vector"],
+                name="legaldecision_search_other",
+            ),
+        ),
+    ]
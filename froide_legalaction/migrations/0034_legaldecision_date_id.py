@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0033_legaldecisiontranslation_search_other"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="legaldecision",
+            index=models.Index(
+                models.OrderBy(models.F("date"), descending=True, nulls_last=True),
+                models.OrderBy(models.F("id"), descending=True),
+                name="legaldecision_date_id",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0034_legaldecision_date_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldecisiontranslation",
+            name="display_court",
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="legaldecisiontranslation",
+            name="display_date",
+            field=models.CharField(blank=True, editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name="legaldecisiontranslation",
+            name="display_law",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="legaldecisiontranslation",
+            name="display_title",
+            field=models.CharField(blank=True, editable=False, max_length=1000),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def populate_updated_at(apps, schema_editor):
+    LegalDecision = apps.get_model("froide_legalaction", "LegalDecision")
+    LegalDecision.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0035_legaldecisiontranslation_display_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldecision",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_updated_at, migrations.RunPython.noop),
+    ]
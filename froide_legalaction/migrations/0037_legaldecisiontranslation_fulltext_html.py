@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0036_legaldecision_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldecisiontranslation",
+            name="fulltext_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="legaldecisiontranslation",
+            name="fulltext_toc",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0037_legaldecisiontranslation_fulltext_html"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LegalDecisionParagraph",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("language_code", models.CharField(max_length=15)),
+                ("position", models.PositiveIntegerField()),
+                ("section", models.PositiveIntegerField(default=0)),
+                ("anchor", models.CharField(max_length=255)),
+                ("html", models.TextField()),
+                ("text", models.TextField()),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(
+                        default="", editable=False
+                    ),
+                ),
+                (
+                    "decision",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="paragraph_set",
+                        to="froide_legalaction.legaldecision",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("decision", "language_code", "position"),
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        condition=models.Q(("language_code", "de")),
+                        fields=["search_vector"],
+                        name="ldparagraph_search_de",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        condition=models.Q(("language_code", "en")),
+                        fields=["search_vector"],
+                        name="ldparagraph_search_en",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        condition=models.Q(
+                            ("language_code__in", ["de", "en"]), _negated=True
+                        ),
+                        fields=["search_vector"],
+                        name="ldparagraph_search_other",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("decision", "language_code", "position"),
+                        name="legaldecisionparagraph_position",
+                    )
+                ],
+            },
+        ),
+    ]
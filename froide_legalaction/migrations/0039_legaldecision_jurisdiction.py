@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_jurisdiction(apps, schema_editor):
+    LegalDecision = apps.get_model("froide_legalaction", "LegalDecision")
+    PublicBody = apps.get_model("publicbody", "PublicBody")
+    LegalDecision.objects.filter(foi_court__isnull=False).update(
+        jurisdiction=models.Subquery(
+            PublicBody.objects.filter(pk=models.OuterRef("foi_court")).values(
+                "jurisdiction"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0038_legaldecisionparagraph"),
+        ("publicbody", "0043_merge_20221019_1020"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="legaldecision",
+            name="jurisdiction",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="legal_decisions",
+                to="publicbody.jurisdiction",
+                verbose_name="Jurisdiction",
+            ),
+        ),
+        migrations.RunPython(populate_jurisdiction, migrations.RunPython.noop),
+    ]
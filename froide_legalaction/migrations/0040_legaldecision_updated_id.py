@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0039_legaldecision_jurisdiction"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="legaldecision",
+            index=models.Index(
+                fields=["updated_at", "id"], name="legaldecision_updated_id"
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0040_legaldecision_updated_id"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="legaldecisiontranslation",
+            name="search_text",
+        ),
+    ]
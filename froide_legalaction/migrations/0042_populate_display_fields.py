@@ -0,0 +1,83 @@
+# Generated by Django 5.1.4 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations
+from django.template import defaultfilters
+from django.utils import translation
+from django.utils.translation import gettext
+
+BATCH_SIZE = 500
+
+
+def get_law_name(foi_law, language):
+    names = {
+        law_translation.language_code: law_translation.name
+        for law_translation in foi_law.translations.all()
+    }
+    return names.get(language) or names.get(settings.LANGUAGE_CODE, "")
+
+
+def get_display_fields(decision, decision_translation):
+    # Mirrors LegalDecision.get_display_fields, which historical models lack
+    language = decision_translation.language_code
+    with translation.override(language):
+        if decision.foi_court:
+            court_name = decision.foi_court.name
+        else:
+            court_name = decision_translation.court
+        foi_laws = decision.foi_laws.all()
+        if foi_laws:
+            law_name = ", ".join(get_law_name(foi_law, language) for foi_law in foi_laws)
+        else:
+            law_name = decision_translation.law
+        formatted_date = defaultfilters.date(decision.date, "DATE_FORMAT")
+        if decision.decision_type and court_name:
+            decision_type = gettext(decision.get_decision_type_display())
+            if decision.date:
+                title = gettext("{} of {} on {}").format(
+                    decision_type, court_name, formatted_date
+                )
+            else:
+                title = gettext("{} of {}").format(decision_type, court_name)
+        elif decision.foi_document:
+            title = decision.foi_document.title
+        else:
+            title = decision.reference
+    return {
+        "display_title": title,
+        "display_court": court_name,
+        "display_law": law_name,
+        "display_date": formatted_date,
+    }
+
+
+def populate_display_fields(apps, schema_editor):
+    LegalDecision = apps.get_model("froide_legalaction", "LegalDecision")
+    LegalDecisionTranslation = apps.get_model(
+        "froide_legalaction", "LegalDecisionTranslation"
+    )
+    decisions = LegalDecision.objects.select_related(
+        "foi_court", "foi_document"
+    ).prefetch_related("translations", "foi_laws__translations")
+    fields = ("display_title", "display_court", "display_law", "display_date")
+    translations = []
+    for decision in decisions.iterator(chunk_size=BATCH_SIZE):
+        for decision_translation in decision.translations.all():
+            display_fields = get_display_fields(decision, decision_translation)
+            for name, value in display_fields.items():
+                setattr(decision_translation, name, value)
+            translations.append(decision_translation)
+        if len(translations) >= BATCH_SIZE:
+            LegalDecisionTranslation.objects.bulk_update(translations, fields)
+            translations = []
+    LegalDecisionTranslation.objects.bulk_update(translations, fields)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0041_remove_legaldecisiontranslation_search_text"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_display_fields, migrations.RunPython.noop),
+    ]
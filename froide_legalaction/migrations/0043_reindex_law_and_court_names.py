@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:00
+
+from django.db import migrations
+
+
+def mark_search_index_dirty(apps, schema_editor):
+    # law and court names are now part of the search vectors
+    LegalDecision = apps.get_model("froide_legalaction", "LegalDecision")
+    LegalDecision.objects.update(search_index_dirty=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("froide_legalaction", "0042_populate_display_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_search_index_dirty, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,27 @@
 import datetime
 
-from django.http import Http404
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import cc_delim_re, get_conditional_response
+from django.utils.http import parse_http_date_safe
 
 from legal_advice_builder.models import LawCase
 
 from froide.foirequest.models import FoiRequest
 
+from .cache import SEARCH_CACHE_TIMEOUT, make_cache_key, normalize_query
 from .helper.permissions.klageautomat import can_create_answer
 
+PAGE_CACHE_HEADERS = (
+    "Content-Type",
+    "Content-Language",
+    "ETag",
+    "Last-Modified",
+    "Vary",
+)
+
 
 class KlageautomatMixin:
     def dispatch(self, request, *args, **kwargs):
@@ -49,3 +62,112 @@ class KlageautomatMixin:
             )
 
         return attachments
+
+
+class AnonymousPageCacheMixin:
+    """
+    Caches whole pages for anonymous visitors per path, language and
+    normalized query string until the decision corpus changes. Hits are
+    served without touching the view or the database.
+
+    Like Django's cache middleware, pages setting cookies or using the
+    CSRF token are not cached and the request headers named in the page's
+    Vary header are part of the cache key.
+    """
+
+    page_cache_timeout = SEARCH_CACHE_TIMEOUT
+
+    def get_page_cache_query(self, request):
+        query = []
+        for key, value in normalize_query(request.GET):
+            if key == "page":
+                try:
+                    value = int(value)
+                except ValueError:
+                    continue
+                if value == 1:
+                    continue
+            query.append((key, str(value)))
+        return tuple(query)
+
+    def get_page_vary_key(self, request):
+        return make_cache_key("page-vary", request.path)
+
+    def get_page_cache_key(self, request, vary_headers):
+        return make_cache_key(
+            "page",
+            request.path,
+            request.LANGUAGE_CODE,
+            self.get_page_cache_query(request),
+            tuple(request.headers.get(header, "") for header in vary_headers),
+        )
+
+    def get_vary_headers(self, response):
+        if not response.has_header("Vary"):
+            return ()
+        return tuple(
+            sorted({header.lower() for header in cc_delim_re.split(response["Vary"])})
+        )
+
+    def can_cache_response(self, request, response):
+        return (
+            not response.cookies
+            # A CSRF token rendered into the page is the visitor's own
+            and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+            and "*" not in self.get_vary_headers(response)
+        )
+
+    def can_cache_page(self, request):
+        return (
+            self.page_cache_timeout
+            and request.method in ("GET", "HEAD")
+            and not request.user.is_authenticated
+            # Pending messages have to be shown and consumed by a real render
+            and not len(messages.get_messages(request))
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.can_cache_page(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        vary_key = self.get_page_vary_key(request)
+        vary_headers = cache.get(vary_key)
+        page = None
+        if vary_headers is not None:
+            page = cache.get(self.get_page_cache_key(request, vary_headers))
+        if page is not None:
+            response = HttpResponse(page["content"], headers=page["headers"])
+            return get_conditional_response(
+                request,
+                etag=response.get("ETag"),
+                last_modified=parse_http_date_safe(response.get("Last-Modified")),
+                response=response,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+
+            def cache_page(response):
+                if not self.can_cache_response(request, response):
+                    return
+                vary_headers = self.get_vary_headers(response)
+                page = {
+                    "content": response.content,
+                    "headers": {
+                        header: response[header]
+                        for header in PAGE_CACHE_HEADERS
+                        if response.has_header(header)
+                    },
+                }
+                cache.set(vary_key, vary_headers, self.page_cache_timeout)
+                cache.set(
+                    self.get_page_cache_key(request, vary_headers),
+                    page,
+                    self.page_cache_timeout,
+                )
+
+            if hasattr(response, "add_post_render_callback"):
+                response.add_post_render_callback(cache_page)
+            else:
+                cache_page(response)
+        return response
@@ -1,5 +1,6 @@
 from .decision import (
     LegalDecision,
+    LegalDecisionParagraph,
     LegalDecisionTag,
     LegalDecisionTagTranslation,
     LegalDecisionTranslation,
@@ -9,6 +10,7 @@ from .proposal import Proposal, ProposalDocument
 
 __all__ = [
     "LegalDecision",
+    "LegalDecisionParagraph",
     "LegalDecisionTag",
     "LegalDecisionTagTranslation",
     "LegalDecisionTranslation",
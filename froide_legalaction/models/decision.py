@@ -1,18 +1,48 @@
 import functools
+import re
+import time
 
 from django.conf import settings
-from django.contrib.postgres.search import SearchVector, SearchVectorField
-from django.db import models
-from django.db.models import Q
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+    TrigramWordSimilarity,
+)
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Greatest, Upper
 from django.template import defaultfilters
 from django.urls import reverse
+from django.utils import timezone, translation
 from django.utils.translation import gettext_lazy as _
 
 from parler.managers import TranslatableManager
 from parler.models import TranslatableModel, TranslatedFields
+from parler.utils.i18n import get_active_language_choices
 
 from froide.document.models import Document
-from froide.publicbody.models import FoiLaw, PublicBody
+from froide.publicbody.models import FoiLaw, Jurisdiction, PublicBody
+
+from ..cache import bump_decision_generation
+from ..decision_identifier import make_reference_key
+from ..fulltext import join_fulltext, split_fulltext
+
+# Full text search configurations by language code. Each of these
+# languages gets its own partial GIN index on the search vector.
+SEARCH_LANGUAGE_CONFIGS = {
+    "de": "german",
+    "en": "english",
+}
+# Factor applied to the rank of matches in the active language
+ACTIVE_LANGUAGE_RANK_BOOST = 2.0
+# Translated fields holding precomputed display strings
+DISPLAY_FIELDS = ("display_title", "display_court", "display_law", "display_date")
+# Upper bound of candidates fetched per trigram index scan
+FUZZY_SEARCH_LIMIT = 50
 
 
 class LegalDecisionTagManager(TranslatableManager):
@@ -45,36 +75,445 @@ class LegalDecisionManager(TranslatableManager):
             | Q(foi_court__isnull=True)
         )
 
+    def for_list(self, language=None):
+        """
+        Decisions with just what their list cards display: translations in
+        the active language and its fallbacks without full text and search
+        columns and tags with their names. Court, laws and document are
+        shown through the stored display strings and not loaded.
+        """
+        from froide_legalaction.models import (
+            LegalDecisionTagTranslation,
+            LegalDecisionTranslation,
+        )
+
+        languages = get_active_language_choices(language)
+        translations = LegalDecisionTranslation.objects.filter(
+            language_code__in=languages
+        ).defer(
+            "fulltext",
+            "fulltext_html",
+            "fulltext_toc",
+            "guiding_principle",
+            "search_vector",
+        )
+        tags = LegalDecisionTag.objects.prefetch_related(None).prefetch_related(
+            models.Prefetch(
+                "translations",
+                queryset=LegalDecisionTagTranslation.objects.filter(
+                    language_code__in=languages
+                ),
+            )
+        )
+        return (
+            self.get_queryset()
+            .defer("source_data", "paragraphs")
+            .prefetch_related(None)
+            .prefetch_related(
+                models.Prefetch("translations", queryset=translations),
+                models.Prefetch("tags", queryset=tags),
+            )
+        )
+
+    def for_detail(self):
+        """
+        Decisions for their detail page, which shows the stored full text
+        HTML instead of rendering the full text.
+        """
+        from froide_legalaction.models import LegalDecisionTranslation
+
+        translations = LegalDecisionTranslation.objects.defer(
+            "fulltext", "search_vector"
+        )
+        return (
+            self.get_queryset()
+            .select_related("foi_court", "foi_document")
+            .prefetch_related(None)
+            .prefetch_related(
+                models.Prefetch("translations", queryset=translations),
+                "tags",
+                "foi_laws",
+            )
+        )
+
     def get_search_lang(self, language):
-        if language == "de":
-            return "german"
-        elif language == "en":
-            return "english"
-        return "simple"
+        return SEARCH_LANGUAGE_CONFIGS.get(language, "simple")
+
+    def get_prefix_search_string(self, value):
+        """
+        Raw tsquery matching all words in ``value`` with the last word
+        as a prefix, for searching while typing. None if there are no words.
+        """
+        words = re.findall(r"\w+", value)
+        if not words:
+            return None
+        return " & ".join(words[:-1] + ["{}:*".format(words[-1])])
+
+    def search(self, qs, value, language, search_type="plain"):
+        """
+        Full text search over the translations in all languages, each
+        with its own search configuration, in one statement. Every decision
+        is returned once, annotated with the rank of its best matching
+        translation, where matches in ``language`` are preferred.
+        """
+        from froide_legalaction.models import LegalDecisionTranslation
+
+        matches, rank = self.get_search_expressions(value, language, search_type)
+        translations = LegalDecisionTranslation.objects.filter(matches)
+        best_rank = (
+            translations.filter(master=OuterRef("pk"))
+            .annotate(rank=rank)
+            .order_by("-rank")
+            .values("rank")[:1]
+        )
+        return (
+            qs.filter(pk__in=translations.values("master_id"))
+            .annotate(rank=Subquery(best_rank))
+            .order_by("-rank")
+        )
+
+    def get_search_expressions(self, value, language, search_type="plain"):
+        """
+        Returns the filter matching ``value`` in rows with ``language_code``
+        and ``search_vector`` columns, like translations and paragraphs,
+        and the expression ranking them.
+        """
+        matches = Q()
+        ranks = []
+        for language_q, config in self.get_search_language_filters():
+            query = SearchQuery(value, search_type=search_type, config=config)
+            matches |= language_q & Q(search_vector=query)
+            ranks.append(When(language_q, then=SearchRank(F("search_vector"), query)))
+        # ts_rank() returns a real, as double precision the rank survives
+        # the round trip through a pagination cursor unchanged
+        rank = Cast(
+            Case(*ranks)
+            * Case(
+                When(language_code=language, then=Value(ACTIVE_LANGUAGE_RANK_BOOST)),
+                default=Value(1.0),
+            ),
+            output_field=models.FloatField(),
+        )
+        return matches, rank
+
+    def get_matching_paragraphs(self, ids, value, language, search_type="plain"):
+        """
+        Maps the decisions in ``ids`` to the anchor of their paragraph
+        best matching ``value``, in one statement.
+        """
+        matches, rank = self.get_search_expressions(value, language, search_type)
+        rows = (
+            LegalDecisionParagraph.objects.filter(matches, decision_id__in=ids)
+            .annotate(rank=rank)
+            .order_by("decision_id", "-rank", "position")
+            .distinct("decision_id")
+            .values_list("decision_id", "anchor")
+        )
+        return dict(rows)
+
+    def get_search_language_filters(self):
+        """
+        Pairs of translation filter and search configuration matching the
+        predicates of the partial search vector indexes.
+        """
+        filters = [
+            (Q(language_code=language), config)
+            for language, config in SEARCH_LANGUAGE_CONFIGS.items()
+        ]
+        filters.append((~Q(language_code__in=list(SEARCH_LANGUAGE_CONFIGS)), "simple"))
+        return filters
 
     def get_search_vector(self, language):
+        """
+        Weighted search vector for translations in ``language``:
+        title, reference and ECLI (A), guiding principle, tags, law and
+        court names (B), abstract (C) and full text (D).
+        """
         SEARCH_LANG = self.get_search_lang(language)
         fields = [
-            ("search_text", "A"),
+            (
+                (
+                    "title",
+                    self.get_decision_field("reference"),
+                    self.get_decision_field("ecli"),
+                ),
+                "A",
+            ),
+            (
+                (
+                    "guiding_principle",
+                    self.get_tag_names(language),
+                    "display_law",
+                    "display_court",
+                ),
+                "B",
+            ),
+            (("abstract",), "C"),
+            (("fulltext",), "D"),
         ]
         return functools.reduce(
             lambda a, b: a + b,
-            [SearchVector(f, weight=w, config=SEARCH_LANG) for f, w in fields],
+            [SearchVector(*f, weight=w, config=SEARCH_LANG) for f, w in fields],
         )
 
-    def update_search_index(self, qs=None):
+    def get_decision_field(self, name):
+        return Subquery(
+            self.model._base_manager.filter(pk=OuterRef("master_id")).values(name)
+        )
+
+    def get_tag_names(self, language):
+        from froide_legalaction.models import LegalDecisionTagTranslation
+
+        return Subquery(
+            LegalDecisionTagTranslation.objects.filter(
+                master__legaldecision=OuterRef("master_id"), language_code=language
+            )
+            .order_by()
+            .values("language_code")
+            .annotate(names=StringAgg("name", delimiter=" "))
+            .values("names")
+        )
+
+    def get_search_translations(self, qs=None):
         from froide_legalaction.models import LegalDecisionTranslation
 
-        if qs is None:
-            qs = self.get_queryset()
-        for decision in qs:
-            decision.generate_search_texts()
         translations = LegalDecisionTranslation.objects.all()
-        languages = [entry.get("code") for entry in settings.PARLER_LANGUAGES.get(1)]
-        for language in languages:
+        if qs is not None:
+            translations = translations.filter(master__in=qs.values("pk"))
+        return translations
+
+    def get_search_languages(self, translations):
+        return list(
+            translations.order_by().values_list("language_code", flat=True).distinct()
+        )
+
+    def rebuild_search_index(self, qs=None):
+        """
+        Rebuild ``search_vector`` for the given decisions in bulk. Without ``qs`` every decision is reindexed.
+        Returns a tuple of rows touched and elapsed seconds.
+        """
+        start = time.monotonic()
+        translations = self.get_search_translations(qs=qs)
+        rows = 0
+        for language in self.get_search_languages(translations):
             translations_for_lang = translations.filter(language_code=language)
-            search_vector = self.get_search_vector(language)
-            translations_for_lang.update(search_vector=search_vector)
+            rows += translations_for_lang.update(
+                search_vector=self.get_search_vector(language)
+            )
+        # Search results may have changed
+        bump_decision_generation()
+        return rows, time.monotonic() - start
+
+    def update_search_index(self, qs=None):
+        return self.rebuild_search_index(qs=qs)
+
+    def fuzzy_search(self, value, language, limit=FUZZY_SEARCH_LIMIT):
+        """
+        Trigram search over reference, ECLI and the translated title and
+        court. Returns up to ``limit`` tuples of decision id and similarity,
+        most similar first.
+        """
+        from froide_legalaction.models import LegalDecisionTranslation
+
+        decision_matches = (
+            self.model._base_manager.filter(
+                Q(reference__trigram_word_similar=value)
+                | Q(ecli__trigram_word_similar=value)
+            )
+            .annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(value, "reference"),
+                    TrigramWordSimilarity(value, "ecli"),
+                )
+            )
+            .values_list("id", "similarity")
+            .order_by("-similarity")[:limit]
+        )
+        translation_matches = (
+            LegalDecisionTranslation.objects.filter(language_code=language)
+            .filter(
+                Q(title__trigram_word_similar=value)
+                | Q(court__trigram_word_similar=value)
+            )
+            .annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(value, "title"),
+                    TrigramWordSimilarity(value, "court"),
+                )
+            )
+            .values_list("master_id", "similarity")
+            .order_by("-similarity")[:limit]
+        )
+        matches = {}
+        for decision_id, similarity in decision_matches.union(
+            translation_matches, all=True
+        ):
+            matches[decision_id] = max(similarity, matches.get(decision_id, 0))
+        return sorted(matches.items(), key=lambda m: m[1], reverse=True)[:limit]
+
+    def mark_search_index_dirty(self, qs):
+        return qs.update(search_index_dirty=True)
+
+    def set_court_jurisdiction(self, court, jurisdiction_id):
+        """
+        Set the jurisdiction of the decisions of ``court`` that differ.
+        Returns the number of decisions updated.
+        """
+        rows = (
+            self.model._base_manager.filter(foi_court=court)
+            .exclude(jurisdiction_id=jurisdiction_id)
+            .update(jurisdiction_id=jurisdiction_id)
+        )
+        if rows:
+            bump_decision_generation()
+        return rows
+
+    def touch(self, qs):
+        """
+        Marks the decisions in ``qs`` as modified, e.g. after changes to
+        their translations or tags that don't save the decision itself.
+        """
+        return qs.update(updated_at=timezone.now())
+
+    def update_dirty_search_index(self, batch_size=500):
+        """
+        Reindex decisions flagged with ``search_index_dirty`` in batches.
+        Returns a tuple of rows touched and elapsed seconds.
+        """
+        start = time.monotonic()
+        rows = 0
+        dirty = self.model._base_manager.filter(search_index_dirty=True)
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    dirty.order_by("id")
+                    .select_for_update(skip_locked=True)
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                batch = self.model._base_manager.filter(id__in=ids)
+                batch.update(search_index_dirty=False)
+                batch_rows, _elapsed = self.rebuild_search_index(qs=batch)
+                rows += batch_rows
+        return rows, time.monotonic() - start
+
+    def update_display_fields(self, qs=None, batch_size=500):
+        """
+        Recompute the display strings of every translation of the decisions
+        in ``qs`` (all decisions by default) in batches. Only translations
+        whose display strings differ are written and their decisions touched
+        and reindexed, as the law and court names are searched.
+        Returns the number of translations updated.
+        """
+        from froide_legalaction.models import LegalDecisionTranslation
+        from froide_legalaction.signals import schedule_search_index_update
+
+        if qs is None:
+            qs = self.model._base_manager.all()
+        ids = list(qs.order_by("id").values_list("id", flat=True))
+        rows = 0
+        for offset in range(0, len(ids), batch_size):
+            batch_ids = ids[offset : offset + batch_size]
+            decisions = (
+                self.model._base_manager.filter(id__in=batch_ids)
+                .select_related("foi_court", "foi_document")
+                .prefetch_related("translations", "foi_laws__translations")
+            )
+            translations = []
+            changed_ids = set()
+            for decision in decisions:
+                for decision_translation in decision.translations.all():
+                    display_fields = decision.get_display_fields(
+                        decision_translation.language_code
+                    )
+                    changed = False
+                    for name, value in display_fields.items():
+                        if getattr(decision_translation, name) != value:
+                            setattr(decision_translation, name, value)
+                            changed = True
+                    if changed:
+                        translations.append(decision_translation)
+                        changed_ids.add(decision.id)
+            if not translations:
+                continue
+            LegalDecisionTranslation.objects.bulk_update(translations, DISPLAY_FIELDS)
+            changed = self.model._base_manager.filter(id__in=changed_ids)
+            self.mark_search_index_dirty(changed)
+            self.touch(changed)
+            rows += len(translations)
+        if rows:
+            bump_decision_generation()
+            schedule_search_index_update()
+        return rows
+
+    def update_fulltext_html(self, qs=None, batch_size=100):
+        """
+        Re-render the stored full text HTML, table of contents and paragraph
+        index of every translation of the decisions in ``qs`` (all by
+        default) in batches. Returns the number of translations updated.
+        """
+        from froide_legalaction.models import LegalDecisionTranslation
+
+        if qs is None:
+            qs = self.model._base_manager.all()
+        translations = LegalDecisionTranslation.objects.filter(
+            master__in=qs.values("pk")
+        ).order_by("id")
+        ids = list(translations.values_list("id", flat=True))
+        for offset in range(0, len(ids), batch_size):
+            batch = list(
+                LegalDecisionTranslation.objects.filter(
+                    id__in=ids[offset : offset + batch_size]
+                ).only("id", "master_id", "language_code", "fulltext")
+            )
+            with transaction.atomic():
+                for decision_translation in batch:
+                    paragraphs = split_fulltext(decision_translation.fulltext)
+                    (
+                        decision_translation.fulltext_html,
+                        decision_translation.fulltext_toc,
+                    ) = join_fulltext(paragraphs)
+                    self.update_paragraphs(
+                        decision_translation.master_id,
+                        decision_translation.language_code,
+                        paragraphs,
+                    )
+                LegalDecisionTranslation.objects.bulk_update(
+                    batch, ["fulltext_html", "fulltext_toc"]
+                )
+        if ids:
+            self.touch(qs)
+            bump_decision_generation()
+        return len(ids)
+
+    def update_paragraphs(self, decision_id, language, paragraphs):
+        """
+        Replace the indexed paragraphs of a decision's translation in
+        ``language`` with ``paragraphs`` from ``split_fulltext``.
+        """
+        existing = LegalDecisionParagraph.objects.filter(
+            decision_id=decision_id, language_code=language
+        )
+        existing.delete()
+        LegalDecisionParagraph.objects.bulk_create(
+            [
+                LegalDecisionParagraph(
+                    decision_id=decision_id,
+                    language_code=language,
+                    position=paragraph["position"],
+                    section=paragraph["section"],
+                    anchor=paragraph["anchor"],
+                    html=paragraph["html"],
+                    text=paragraph["text"],
+                )
+                for paragraph in paragraphs
+            ],
+            batch_size=500,
+        )
+        existing.update(
+            search_vector=SearchVector("text", config=self.get_search_lang(language))
+        )
 
 
 class LegalDecision(TranslatableModel):
@@ -98,8 +537,42 @@ class LegalDecision(TranslatableModel):
             max_length=500, blank=True, verbose_name=_("Name of Court")
         ),
         law=models.CharField(max_length=500, blank=True, verbose_name=_("Law")),
-        search_text=models.TextField(blank=True),
+        display_title=models.CharField(max_length=1000, blank=True, editable=False),
+        display_court=models.CharField(max_length=500, blank=True, editable=False),
+        display_law=models.TextField(blank=True, editable=False),
+        display_date=models.CharField(max_length=50, blank=True, editable=False),
+        fulltext_html=models.TextField(blank=True, editable=False),
+        fulltext_toc=models.JSONField(default=list, blank=True, editable=False),
         search_vector=SearchVectorField(default="", editable=False),
+        meta={
+            "indexes": [
+                GinIndex(
+                    fields=["search_vector"],
+                    condition=Q(language_code=language),
+                    name="legaldecision_search_{}".format(language),
+                )
+                for language in SEARCH_LANGUAGE_CONFIGS
+            ]
+            + [
+                GinIndex(
+                    fields=["search_vector"],
+                    condition=~Q(language_code__in=list(SEARCH_LANGUAGE_CONFIGS)),
+                    name="legaldecision_search_other",
+                ),
+            ]
+            + [
+                GinIndex(
+                    fields=["title"],
+                    opclasses=["gin_trgm_ops"],
+                    name="legaldecision_title_trgm",
+                ),
+                GinIndex(
+                    fields=["court"],
+                    opclasses=["gin_trgm_ops"],
+                    name="legaldecision_court_trgm",
+                ),
+            ]
+        },
     )
 
     tags = models.ManyToManyField(LegalDecisionTag, blank=True)
@@ -115,6 +588,9 @@ class LegalDecision(TranslatableModel):
     reference = models.CharField(
         max_length=200, blank=True, verbose_name=_("docket number")
     )
+    reference_key = models.CharField(
+        max_length=200, blank=True, db_index=True, editable=False
+    )
     ecli = models.CharField(
         max_length=100,
         blank=True,
@@ -150,11 +626,22 @@ class LegalDecision(TranslatableModel):
         related_name="pb_legaldecisions",
         verbose_name=_("Link to Court"),
     )
+    # Copied from foi_court to filter without joining public bodies
+    jurisdiction = models.ForeignKey(
+        Jurisdiction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="legal_decisions",
+        verbose_name=_("Jurisdiction"),
+    )
     foi_laws = models.ManyToManyField(
         FoiLaw, related_name="legal_decisions", blank=True, verbose_name=_("Laws")
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -162,15 +649,88 @@ class LegalDecision(TranslatableModel):
         on_delete=models.SET_NULL,
         related_name="created_legaldecisions",
     )
+    search_index_dirty = models.BooleanField(default=True, editable=False)
 
     objects = LegalDecisionManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(search_index_dirty=True),
+                name="legaldecision_search_dirty",
+            ),
+            models.Index(Upper("ecli"), name="legaldecision_ecli_upper"),
+            models.Index(
+                F("date").desc(nulls_last=True),
+                F("id").desc(),
+                name="legaldecision_date_id",
+            ),
+            models.Index(
+                fields=["updated_at", "id"],
+                name="legaldecision_updated_id",
+            ),
+            GinIndex(
+                fields=["reference"],
+                opclasses=["gin_trgm_ops"],
+                name="legaldecision_reference_trgm",
+            ),
+            GinIndex(
+                fields=["ecli"],
+                opclasses=["gin_trgm_ops"],
+                name="legaldecision_ecli_trgm",
+            ),
+        ]
+
     def __str__(self):
         return "{}".format(self.reference)
 
+    def save(self, *args, **kwargs):
+        self.reference_key = make_reference_key(self.reference)
+        self.jurisdiction_id = (
+            self.foi_court.jurisdiction_id if self.foi_court else None
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            # Derived fields and the modification time that caches and
+            # conditional requests depend on are written with any update
+            kwargs["update_fields"] = {
+                *update_fields,
+                "updated_at",
+                "reference_key",
+                "jurisdiction",
+            }
+        super().save(*args, **kwargs)
+        LegalDecision.objects.update_display_fields(
+            qs=LegalDecision.objects.filter(pk=self.pk)
+        )
+
+    def save_translation(self, translation, *args, **kwargs):
+        paragraphs = None
+        if translation.pk is None or translation.is_modified:
+            paragraphs = split_fulltext(translation.fulltext)
+            translation.fulltext_html, translation.fulltext_toc = join_fulltext(
+                paragraphs
+            )
+        super().save_translation(translation, *args, **kwargs)
+        if paragraphs is not None:
+            LegalDecision.objects.update_paragraphs(
+                self.pk, translation.language_code, paragraphs
+            )
+
     def get_absolute_url(self):
         return reverse("legaldecision:detail", kwargs={"pk": self.pk})
 
+    def get_display_language(self):
+        """
+        Language of the translation shown in the current language,
+        after falling back.
+        """
+        for language in [self.get_current_language()] + self.get_fallback_languages():
+            if self.has_translation(language):
+                return language
+        return None
+
     @property
     def formatted_date(self):
         return defaultfilters.date(self.date, "DATE_FORMAT")
@@ -199,10 +759,27 @@ class LegalDecision(TranslatableModel):
 
     @property
     def law_name(self):
-        if self.foi_laws.all():
-            return ", ".join([foi_law.name for foi_law in self.foi_laws.all()])
+        foi_laws = self.foi_laws.all()
+        if foi_laws:
+            return ", ".join([foi_law.name for foi_law in foi_laws])
         return self.law
 
+    def get_display_fields(self, language):
+        """
+        Returns the display strings in ``language``, which are stored on
+        the translation so pages don't have to follow the relations.
+        """
+        with translation.override(language):
+            self.set_current_language(language)
+            for foi_law in self.foi_laws.all():
+                foi_law.set_current_language(language)
+            return {
+                "display_title": str(self.generated_title),
+                "display_court": self.court_name,
+                "display_law": self.law_name,
+                "display_date": self.formatted_date,
+            }
+
     def abstract_is_set(self):
         try:
             self.abstract
@@ -238,8 +815,8 @@ class LegalDecision(TranslatableModel):
 
         for field in all_fields:
             is_relevant = field.name in relevant_fields
-            has_field = hasattr(self, field.name)
             if is_relevant:
+                has_field = hasattr(self, field.name)
                 if has_field and not getattr(self, field.name):
                     res.append(str(field.verbose_name))
                 elif not has_field:
@@ -248,26 +825,47 @@ class LegalDecision(TranslatableModel):
             res.append(str(_("Laws")))
         return ", ".join(res)
 
-    def generate_search_texts(self):
-        tags = self.tags.all()
-        for translation in self.translations.all():
-            fulltext = ""
-            if translation.fulltext:
-                fulltext = translation.fulltext
-            tag_string = " ".join(
-                [
-                    tag.translations.filter(
-                        language_code=translation.language_code
-                    ).values_list("name", flat=True)[0]
-                    for tag in tags
-                ]
+
+class LegalDecisionParagraph(models.Model):
+    """
+    Paragraph of the full text of a decision's translation, indexed for
+    search so results can point to the matching paragraph. Paragraphs with
+    a heading start a new section of the full text.
+    """
+
+    decision = models.ForeignKey(
+        LegalDecision, on_delete=models.CASCADE, related_name="paragraph_set"
+    )
+    language_code = models.CharField(max_length=15)
+    position = models.PositiveIntegerField()
+    section = models.PositiveIntegerField(default=0)
+    anchor = models.CharField(max_length=255)
+    html = models.TextField()
+    text = models.TextField()
+    search_vector = SearchVectorField(default="", editable=False)
+
+    class Meta:
+        ordering = ("decision", "language_code", "position")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["decision", "language_code", "position"],
+                name="legaldecisionparagraph_position",
             )
-            text = "{} {} {} {} {}".format(
-                self.reference,
-                translation.law,
-                translation.abstract,
-                fulltext,
-                tag_string,
+        ]
+        indexes = [
+            GinIndex(
+                fields=["search_vector"],
+                condition=Q(language_code=language),
+                name="ldparagraph_search_{}".format(language),
             )
-            translation.search_text = text
-            translation.save()
+            for language in SEARCH_LANGUAGE_CONFIGS
+        ] + [
+            GinIndex(
+                fields=["search_vector"],
+                condition=~Q(language_code__in=list(SEARCH_LANGUAGE_CONFIGS)),
+                name="ldparagraph_search_other",
+            ),
+        ]
+
+    def __str__(self):
+        return "{} ({}) {}".format(self.decision_id, self.language_code, self.anchor)
@@ -0,0 +1,177 @@
+from datetime import date
+
+from django.db.models import F, Q
+from django.http import Http404
+from django.utils.http import urlencode
+from django.utils.translation import gettext_lazy as _
+
+# Query parameters selecting a page, dropped when the filters change
+PAGE_PARAMETERS = ("page", "after", "before")
+CURSOR_PARSERS = {
+    "date": date.fromisoformat,
+    "rank": float,
+}
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the (key, id) pair of the previous
+    page instead of counting and offsetting. The first ``offset_pages`` are
+    still addressed by number alone, deeper pages need a cursor. Counts are
+    capped at ``count_limit`` unless it is None.
+    """
+
+    def __init__(
+        self, queryset, per_page, key="date", offset_pages=5, count_limit=1000
+    ):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.key = key
+        self.offset_pages = offset_pages
+        self.count_limit = count_limit
+
+    def get_ordering(self, reverse=False):
+        if reverse:
+            return [F(self.key).asc(nulls_first=True), F("id").asc()]
+        return [F(self.key).desc(nulls_last=True), F("id").desc()]
+
+    def get_seek_filter(self, value, pk, reverse=False):
+        isnull = "{}__isnull".format(self.key)
+        if reverse:
+            if value is None:
+                return Q(**{isnull: False}) | Q(**{isnull: True, "id__gt": pk})
+            return Q(**{"{}__gt".format(self.key): value}) | Q(
+                **{self.key: value, "id__gt": pk}
+            )
+        if value is None:
+            return Q(**{isnull: True, "id__lt": pk})
+        return (
+            Q(**{"{}__lt".format(self.key): value})
+            | Q(**{self.key: value, "id__lt": pk})
+            | Q(**{isnull: True})
+        )
+
+    def make_cursor(self, row):
+        pk, value = row
+        if value is None:
+            value = ""
+        elif isinstance(value, date):
+            value = value.isoformat()
+        else:
+            value = repr(value)
+        return "{}_{}".format(value, pk)
+
+    def parse_cursor(self, cursor):
+        value, pk = cursor.rsplit("_", 1)
+        value = CURSOR_PARSERS[self.key](value) if value else None
+        return value, int(pk)
+
+    def get_count(self):
+        """
+        Returns the number of results, capped at ``count_limit``,
+        and whether the cap was hit.
+        """
+        qs = self.queryset.order_by().values("pk")
+        if self.count_limit is None:
+            return qs.count(), False
+        count = qs[: self.count_limit + 1].count()
+        return min(count, self.count_limit), count > self.count_limit
+
+    def get_page_data(self, number, after=None, before=None):
+        """
+        Returns a dict describing the requested page with the ordered ids,
+        the (capped) count and the query strings of the neighbouring pages.
+        Only contains plain data so it can be cached.
+        """
+        try:
+            number = max(int(number or 1), 1)
+            cursor = after or before
+            if cursor:
+                value, pk = self.parse_cursor(cursor)
+        except (KeyError, ValueError):
+            raise Http404(_("Invalid page.")) from None
+
+        rows = self.queryset.values_list("id", self.key)
+        if cursor:
+            reverse = not after
+            rows = list(
+                rows.filter(self.get_seek_filter(value, pk, reverse=reverse)).order_by(
+                    *self.get_ordering(reverse=reverse)
+                )[: self.per_page + 1]
+            )
+            if not rows:
+                raise Http404(_("Invalid page."))
+            more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            if reverse:
+                rows.reverse()
+            has_next = more if after else True
+            has_previous = more if before else number > 1
+        else:
+            if number > self.offset_pages:
+                raise Http404(_("Invalid page."))
+            start = (number - 1) * self.per_page
+            rows = list(
+                rows.order_by(*self.get_ordering())[start : start + self.per_page + 1]
+            )
+            if not rows and number > 1:
+                raise Http404(_("Invalid page."))
+            has_next = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            has_previous = number > 1
+
+        count, count_capped = self.get_count()
+        return {
+            "ids": [pk for pk, _value in rows],
+            "number": number,
+            "count": count,
+            "count_capped": count_capped,
+            "next_query": self.get_page_query(number + 1, after=rows[-1:])
+            if has_next
+            else None,
+            "previous_query": self.get_page_query(number - 1, before=rows[:1])
+            if has_previous
+            else None,
+        }
+
+    def get_page_query(self, number, after=(), before=()):
+        if number <= self.offset_pages:
+            return urlencode({"page": number})
+        if after:
+            return urlencode({"page": number, "after": self.make_cursor(after[0])})
+        return urlencode({"page": number, "before": self.make_cursor(before[0])})
+
+
+class KeysetPage:
+    """
+    Page of objects described by the data of ``KeysetPaginator.get_page_data``.
+    """
+
+    def __init__(self, object_list, data, per_page):
+        self.object_list = object_list
+        self.number = data["number"]
+        self.count = data["count"]
+        self.count_capped = data["count_capped"]
+        self.next_query = data["next_query"]
+        self.previous_query = data["previous_query"]
+        self.per_page = per_page
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_query is not None
+
+    def has_previous(self):
+        return self.previous_query is not None
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.per_page + 1
+
+    def end_index(self):
+        return (self.number - 1) * self.per_page + len(self.object_list)
@@ -1,8 +1,19 @@
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import mail_managers
+from django.db import transaction
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+SEARCH_INDEX_SCHEDULED_KEY = "froide_legalaction:search_index_scheduled"
+# seconds to collect changes before the dirty decisions are reindexed
+SEARCH_INDEX_DEBOUNCE = 60
+# Fields of froide's models that the stored display strings are built from
+COURT_DISPLAY_FIELDS = frozenset(("name",))
+LAW_DISPLAY_FIELDS = frozenset(("name",))
+DOCUMENT_DISPLAY_FIELDS = frozenset(("title",))
+COURT_JURISDICTION_FIELDS = frozenset(("jurisdiction", "jurisdiction_id"))
+
 
 def send_proposal_created_notification(instance=None, created=False, **kwargs):
     if not created or kwargs.get("raw", False):
@@ -12,3 +23,160 @@ def send_proposal_created_notification(instance=None, created=False, **kwargs):
     mail_managers(
         _("New legal action proposal submitted"), admin_url, fail_silently=False
     )
+
+
+def mark_decision_search_index_dirty(instance=None, raw=False, **kwargs):
+    if raw:
+        return
+    instance.search_index_dirty = True
+    schedule_search_index_update()
+
+
+def mark_translation_search_index_dirty(instance=None, raw=False, **kwargs):
+    from .models import LegalDecision
+
+    if raw:
+        return
+    mark_decisions_changed(LegalDecision.objects.filter(pk=instance.master_id))
+
+
+def mark_tag_translation_search_index_dirty(instance=None, raw=False, **kwargs):
+    from .models import LegalDecision
+
+    if raw:
+        return
+    mark_decisions_changed(LegalDecision.objects.filter(tags=instance.master_id))
+
+
+def mark_tag_search_index_dirty(instance=None, **kwargs):
+    from .models import LegalDecision
+
+    mark_decisions_changed(LegalDecision.objects.filter(tags=instance.pk))
+
+
+def mark_decision_tags_search_index_dirty(
+    instance=None, action=None, reverse=False, pk_set=None, **kwargs
+):
+    from .models import LegalDecision
+
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        qs = LegalDecision.objects.filter(pk=instance.pk)
+    elif action == "pre_clear":
+        qs = LegalDecision.objects.filter(tags=instance.pk)
+    else:
+        qs = LegalDecision.objects.filter(pk__in=pk_set)
+    mark_decisions_changed(qs)
+
+
+def mark_decisions_changed(qs):
+    """
+    Flags decisions whose translations or tags changed for reindexing
+    and marks them as modified for caches keyed by their ``updated_at``.
+    """
+    from .models import LegalDecision
+
+    LegalDecision.objects.mark_search_index_dirty(qs)
+    LegalDecision.objects.touch(qs)
+    schedule_search_index_update()
+
+
+def schedule_search_index_update():
+    # The debounce key is only set once the changes are committed, a
+    # rolled back transaction must not hold off the next update
+    transaction.on_commit(queue_search_index_update)
+
+
+def queue_search_index_update():
+    from .tasks import update_dirty_search_index
+
+    if cache.add(SEARCH_INDEX_SCHEDULED_KEY, True, SEARCH_INDEX_DEBOUNCE):
+        update_dirty_search_index.apply_async(countdown=SEARCH_INDEX_DEBOUNCE)
+
+
+def update_decision_laws_display_fields(
+    instance=None, action=None, reverse=False, pk_set=None, **kwargs
+):
+    from .models import LegalDecision
+
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            LegalDecision.objects.update_display_fields(
+                qs=LegalDecision.objects.filter(pk=instance.pk)
+            )
+    elif action == "pre_clear":
+        schedule_display_fields_update(
+            LegalDecision.objects.filter(foi_laws=instance.pk)
+        )
+    elif action in ("post_add", "post_remove"):
+        schedule_display_fields_update(LegalDecision.objects.filter(pk__in=pk_set))
+
+
+def may_change_fields(fields, created=False, update_fields=None):
+    """
+    Whether saving an instance may have changed any of ``fields`` of
+    instances decisions refer to. New instances aren't referred to yet and
+    saves limited to other fields can't have changed them, so the receivers
+    on froide's models skip their query for those.
+    """
+    if created:
+        return False
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+def update_court_display_fields(
+    instance=None, raw=False, created=False, update_fields=None, **kwargs
+):
+    from .models import LegalDecision
+
+    if raw or not may_change_fields(COURT_DISPLAY_FIELDS, created, update_fields):
+        return
+    schedule_display_fields_update(LegalDecision.objects.filter(foi_court=instance))
+
+
+def update_court_jurisdiction(
+    instance=None, raw=False, created=False, update_fields=None, **kwargs
+):
+    from .models import LegalDecision
+
+    if raw or not may_change_fields(COURT_JURISDICTION_FIELDS, created, update_fields):
+        return
+    LegalDecision.objects.set_court_jurisdiction(instance, instance.jurisdiction_id)
+
+
+def clear_court_jurisdiction(instance=None, **kwargs):
+    from .models import LegalDecision
+
+    LegalDecision.objects.set_court_jurisdiction(instance, None)
+
+
+def update_law_display_fields(
+    instance=None, raw=False, created=False, update_fields=None, **kwargs
+):
+    from .models import LegalDecision
+
+    if raw or not may_change_fields(LAW_DISPLAY_FIELDS, created, update_fields):
+        return
+    schedule_display_fields_update(LegalDecision.objects.filter(foi_laws=instance))
+
+
+def update_document_display_fields(
+    instance=None, raw=False, created=False, update_fields=None, **kwargs
+):
+    from .models import LegalDecision
+
+    if raw or not may_change_fields(DOCUMENT_DISPLAY_FIELDS, created, update_fields):
+        return
+    schedule_display_fields_update(LegalDecision.objects.filter(foi_document=instance))
+
+
+def schedule_display_fields_update(qs):
+    from .tasks import update_decision_display_fields
+
+    # Collected now, as deleted relations are gone after the commit
+    decision_ids = list(qs.values_list("id", flat=True))
+    if decision_ids:
+        transaction.on_commit(
+            lambda: update_decision_display_fields.delay(decision_ids)
+        )
@@ -0,0 +1,72 @@
+from django.contrib.sitemaps import Sitemap
+from django.core.cache import cache
+from django.db.models import Count, Max, Min
+from django.urls import reverse
+
+from .cache import FRAGMENT_CACHE_TIMEOUT, make_stable_cache_key
+from .models import LegalDecision
+
+SITEMAP_CHUNK_SIZE = 5000
+
+
+class LegalDecisionSitemap(Sitemap):
+    """
+    Sitemap of the legal decision detail pages in chunks of
+    ``SITEMAP_CHUNK_SIZE``. The URLs of a chunk are cached until a
+    decision in its slice of the corpus changes.
+    """
+
+    limit = SITEMAP_CHUNK_SIZE
+    changefreq = "monthly"
+    priority = 0.5
+
+    def items(self):
+        return LegalDecision._base_manager.only("id", "slug", "updated_at").order_by(
+            "id"
+        )
+
+    def location(self, obj):
+        if obj.slug:
+            return reverse("legaldecision:detail", kwargs={"slug": obj.slug})
+        return reverse("legaldecision:detail", kwargs={"pk": obj.pk})
+
+    def lastmod(self, obj):
+        return obj.updated_at
+
+    def get_latest_lastmod(self):
+        # The default evaluates every item for the sitemap index
+        return LegalDecision._base_manager.aggregate(latest=Max("updated_at"))["latest"]
+
+    def get_chunk_signature(self, number):
+        """
+        Describes the decisions of chunk ``number``: any change, insertion
+        or deletion within or before it changes the signature.
+        """
+        start = (number - 1) * self.limit
+        return self.items()[start : start + self.limit].aggregate(
+            count=Count("id"),
+            first=Min("id"),
+            last=Max("id"),
+            updated=Max("updated_at"),
+        )
+
+    def get_urls(self, page=1, site=None, protocol=None):
+        number = self.paginator.validate_number(page)
+        cache_key = make_stable_cache_key(
+            "sitemap",
+            number,
+            site.domain if site else None,
+            protocol,
+            sorted(self.get_chunk_signature(number).items()),
+        )
+        cached = cache.get(cache_key)
+        if cached is None:
+            urls = [
+                # The deferred decisions aren't needed to render the sitemap
+                {key: value for key, value in url.items() if key != "item"}
+                for url in super().get_urls(page=number, site=site, protocol=protocol)
+            ]
+            cached = (urls, getattr(self, "latest_lastmod", None))
+            cache.set(cache_key, cached, FRAGMENT_CACHE_TIMEOUT)
+        urls, self.latest_lastmod = cached
+        return urls
@@ -0,0 +1,23 @@
+from django.core.cache import cache
+
+from froide.celery import app as celery_app
+
+from .signals import SEARCH_INDEX_SCHEDULED_KEY
+
+
+@celery_app.task(name="froide_legalaction.tasks.update_dirty_search_index")
+def update_dirty_search_index():
+    from .models import LegalDecision
+
+    # Changes arriving from now on schedule their own run
+    cache.delete(SEARCH_INDEX_SCHEDULED_KEY)
+    LegalDecision.objects.update_dirty_search_index()
+
+
+@celery_app.task(name="froide_legalaction.tasks.update_decision_display_fields")
+def update_decision_display_fields(decision_ids):
+    from .models import LegalDecision
+
+    LegalDecision.objects.update_display_fields(
+        qs=LegalDecision.objects.filter(id__in=decision_ids)
+    )
@@ -0,0 +1,54 @@
+from django.http import QueryDict
+
+import pytest
+
+from froide.publicbody.factories import PublicBodyFactory
+
+from froide_legalaction.filters import LegalDecisionFilterSet
+from froide_legalaction.models import LegalDecision
+
+
+@pytest.fixture
+def courts():
+    court_a = PublicBodyFactory(name="Verwaltungsgericht A")
+    court_b = PublicBodyFactory(name="Verwaltungsgericht B")
+    LegalDecision.objects.create(reference="1 K 1/20", foi_court=court_a)
+    LegalDecision.objects.create(reference="1 K 2/20", foi_court=court_b)
+    LegalDecision.objects.create(reference="1 K 3/20", foi_court=court_b)
+    return court_a, court_b
+
+
+def make_filterset(query):
+    return LegalDecisionFilterSet(
+        QueryDict(query), queryset=LegalDecision.objects.all()
+    )
+
+
+@pytest.mark.django_db
+def test_selected_court_keeps_other_courts_in_facets(courts):
+    court_a, court_b = courts
+    f = make_filterset("foi_court={}".format(court_a.pk))
+    assert f.qs.count() == 1
+    facets = f.get_facets()
+    assert (str(court_a.pk), court_a.name, 1) in facets["foi_court"]
+    assert (str(court_b.pk), court_b.name, 2) in facets["foi_court"]
+
+
+@pytest.mark.django_db
+def test_selected_court_keeps_other_courts_in_facet_search(courts):
+    court_a, court_b = courts
+    f = make_filterset("foi_court={}".format(court_a.pk))
+    values, has_more = f.search_facet("foi_court")
+    assert values == [
+        (str(court_b.pk), court_b.name, 2),
+        (str(court_a.pk), court_a.name, 1),
+    ]
+    assert not has_more
+
+
+@pytest.mark.django_db
+def test_other_facets_count_the_selected_courts(courts):
+    court_a, court_b = courts
+    f = make_filterset("foi_court={}".format(court_a.pk))
+    facets = f.get_facets()
+    assert [count for _value, _label, count in facets["jurisdiction"]] == [1]
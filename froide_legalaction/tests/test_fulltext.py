@@ -0,0 +1,44 @@
+from froide_legalaction.fulltext import HEADING_PATTERN, make_heading
+
+
+def make_headings(*titles):
+    anchors = set()
+    return [
+        make_heading(
+            HEADING_PATTERN.fullmatch("<h2>{}</h2>".format(title)), anchors, position
+        )
+        for position, title in enumerate(titles)
+    ]
+
+
+def test_heading_anchors_are_unique():
+    headings = make_headings("Gründe 3", "Gründe", "Gründe")
+    assert [heading["id"] for heading in headings] == [
+        "section-grunde-3",
+        "section-grunde",
+        "section-grunde-2",
+    ]
+
+
+def test_heading_anchor_skips_taken_suffixes():
+    headings = make_headings("Tenor", "Tenor 2", "Tenor", "Tenor")
+    assert [heading["id"] for heading in headings] == [
+        "section-tenor",
+        "section-tenor-2",
+        "section-tenor-3",
+        "section-tenor-4",
+    ]
+
+
+def test_heading_title_and_level():
+    anchors = set()
+    heading = make_heading(
+        HEADING_PATTERN.fullmatch("<h3>Kosten &amp; <em>Gebühren</em></h3>"),
+        anchors,
+        0,
+    )
+    assert heading == {
+        "id": "section-kosten-gebuhren",
+        "title": "Kosten & Gebühren",
+        "level": 3,
+    }
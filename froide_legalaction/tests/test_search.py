@@ -0,0 +1,35 @@
+import pytest
+
+from froide_legalaction.models import LegalDecision
+
+
+@pytest.fixture
+def decisions():
+    umwelt = LegalDecision.objects.create(
+        reference="2 K 10/21", law="Umweltinformationsgesetz"
+    )
+    presse = LegalDecision.objects.create(reference="2 K 11/21", law="Pressegesetz")
+    LegalDecision.objects.rebuild_search_index()
+    return umwelt, presse
+
+
+@pytest.mark.django_db
+def test_search_by_law_name(decisions):
+    umwelt, _presse = decisions
+    results = LegalDecision.objects.search(
+        LegalDecision.objects.all(), "Umweltinformationsgesetz", "de"
+    )
+    assert list(results) == [umwelt]
+
+
+@pytest.mark.django_db
+def test_search_by_court_name(decisions):
+    umwelt, _presse = decisions
+    umwelt.set_current_language("de")
+    umwelt.court = "Verwaltungsgericht Schleswig"
+    umwelt.save()
+    LegalDecision.objects.rebuild_search_index()
+    results = LegalDecision.objects.search(
+        LegalDecision.objects.all(), "Schleswig", "de"
+    )
+    assert list(results) == [umwelt]
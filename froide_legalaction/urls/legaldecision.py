@@ -7,6 +7,11 @@ from ..views import (
     LegalDecisionIncompleteListView,
     LegalDecisionIncompleteUpdateView,
     LegalDecisionListView,
+    legal_decision_autocomplete,
+    legal_decision_export,
+    legal_decision_facet_search,
+    legal_decision_live_search,
+    legal_decision_section,
 )
 
 app_name = "legaldecision"
@@ -32,11 +37,36 @@ urlpatterns = [
         LegalDecisionCreateView.as_view(),
         name="create",
     ),
+    path(
+        pgettext_lazy("url part", "autocomplete/"),
+        legal_decision_autocomplete,
+        name="autocomplete",
+    ),
+    path(
+        pgettext_lazy("url part", "search/"),
+        legal_decision_live_search,
+        name="live-search",
+    ),
+    path(
+        pgettext_lazy("url part", "export/"),
+        legal_decision_export,
+        name="export",
+    ),
+    path(
+        pgettext_lazy("url part", "facets/<str:name>/"),
+        legal_decision_facet_search,
+        name="facet-search",
+    ),
     path(
         pgettext_lazy("url part", "<int:pk>/"),
         LegalDecisionDetailView.as_view(),
         name="detail",
     ),
+    path(
+        pgettext_lazy("url part", "<int:pk>/section/<int:section>/"),
+        legal_decision_section,
+        name="section",
+    ),
     path(
         pgettext_lazy("url part", "<slug:slug>/"),
         LegalDecisionDetailView.as_view(),
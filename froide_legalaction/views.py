@@ -1,10 +1,22 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.core.paginator import Paginator
-from django.http import HttpResponse, HttpResponseRedirect
+from django.core.cache import cache
+from django.db.models import Case, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, NullIf
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import Http404, get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.views.generic import DetailView, FormView
 from django.views.generic.edit import UpdateView
 from django.views.generic.list import ListView
@@ -21,7 +33,16 @@ from froide.foirequest.auth import can_write_foirequest
 from froide.foirequest.models import FoiRequest
 from froide.publicbody.models import Classification, PublicBody
 
-from .filters import LegalDecisionFilterSet
+from .cache import (
+    FRAGMENT_CACHE_TIMEOUT,
+    SEARCH_CACHE_TIMEOUT,
+    get_decision_generation_time,
+    make_cache_key,
+    make_fragment_cache_key,
+    normalize_query,
+)
+from .export import EXPORT_FORMATS, export_decisions, parse_since
+from .filters import FACET_LIMIT, LegalDecisionFilterSet
 from .forms import (
     KlageautomatApprovalForm,
     KlageautomatRenderedDocumentForm,
@@ -29,9 +50,25 @@ from .forms import (
     LegalDecisionCreateForm,
     LegalDecisionUpdateForm,
 )
-from .mixins import KlageautomatMixin
-from .models import Instance, LegalDecision
+from .mixins import AnonymousPageCacheMixin, KlageautomatMixin
+from .models import (
+    Instance,
+    LegalDecision,
+    LegalDecisionParagraph,
+    LegalDecisionTranslation,
+)
+from .pagination import PAGE_PARAMETERS, KeysetPage, KeysetPaginator
 from .utils import make_lawsuit_event_calendar
+from .widgets import get_option_query
+
+AUTOCOMPLETE_LIMIT = 10
+LIVE_SEARCH_LIMIT = 10
+LIVE_SEARCH_MAX_AGE = 5 * 60
+# Sections of the full text rendered with the detail page, later
+# sections are fetched when scrolled into view
+INITIAL_SECTIONS = 3
+SECTION_MAX_AGE = 60 * 60
+EXPORT_MAX_AGE = 60 * 60
 
 
 def _get_embed_info(request):
@@ -280,32 +317,199 @@ class KlageautomatAnswerHTMLDownloadView(KlageautomatMixin, HTMLDownloadView):
         ).last()
 
 
-class LegalDecisionListView(ListView):
+def get_decision_list_etag(request, *args, **kwargs):
+    # Pages of logged in users show their permissions and messages
+    if request.user.is_authenticated:
+        return None
+    return make_cache_key(
+        "list-etag", request.LANGUAGE_CODE, normalize_query(request.GET)
+    )
+
+
+def get_decision_list_last_modified(request, *args, **kwargs):
+    if request.user.is_authenticated:
+        return None
+    return get_decision_generation_time()
+
+
+def get_decision_updated_at(request, pk=None, slug=None):
+    if request.user.is_authenticated:
+        return None
+    # Both condition functions need it, look it up once per request
+    if not hasattr(request, "_legaldecision_updated_at"):
+        lookup = {"pk": pk} if pk is not None else {"slug": slug}
+        request._legaldecision_updated_at = (
+            LegalDecision._base_manager.filter(**lookup)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+    return request._legaldecision_updated_at
+
+
+def get_decision_detail_etag(request, pk=None, slug=None):
+    updated_at = get_decision_updated_at(request, pk=pk, slug=slug)
+    if updated_at is None:
+        return None
+    return "{}-{}-{}".format(pk or slug, request.LANGUAGE_CODE, updated_at.timestamp())
+
+
+@method_decorator(
+    condition(
+        etag_func=get_decision_list_etag,
+        last_modified_func=get_decision_list_last_modified,
+    ),
+    name="get",
+)
+class LegalDecisionListView(AnonymousPageCacheMixin, ListView):
     model = LegalDecision
     paginate_by = 10
+    count_limit = 1000
+    facet_limit = FACET_LIMIT
+    search_cache_timeout = SEARCH_CACHE_TIMEOUT
+    show_incomplete_fields = False
     template_name = "froide_legalaction/legaldecision/list.html"
+    card_template_name = "froide_legalaction/includes/_legal_decision.html"
+
+    def get_paginate_by(self, queryset):
+        # The filtered queryset is paginated in get_result_page instead
+        return None
 
     def get_filter_queryset(self):
         return LegalDecision.objects.all()
 
+    def get_search_cache_key(self, f):
+        return make_cache_key(
+            "search",
+            self.request.LANGUAGE_CODE,
+            normalize_query(self.request.GET, keys=f.filters, fold_case=True),
+            normalize_query(self.request.GET, keys=PAGE_PARAMETERS),
+        )
+
+    def get_paginator(self, f):
+        qs = f.qs
+        # Search results are ordered by relevance, everything else by date
+        key = "rank" if "rank" in qs.query.annotations else "date"
+        return KeysetPaginator(
+            qs, self.paginate_by, key=key, count_limit=self.count_limit
+        )
+
+    def get_result_page(self, f):
+        """
+        Returns the requested page of filter results. The ordered ids of the
+        page, the links to its neighbours and the total count are cached per
+        query and corpus generation.
+        """
+        cache_key = None
+        result = None
+        if self.search_cache_timeout:
+            cache_key = self.get_search_cache_key(f)
+            result = cache.get(cache_key)
+        if result is None:
+            result = self.get_paginator(f).get_page_data(
+                self.request.GET.get("page"),
+                after=self.request.GET.get("after"),
+                before=self.request.GET.get("before"),
+            )
+            result["paragraphs"] = f.get_matching_paragraphs(result["ids"])
+            if cache_key:
+                cache.set(cache_key, result, self.search_cache_timeout)
+
+        return KeysetPage(
+            self.get_cards(result["ids"], result["paragraphs"]),
+            result,
+            self.paginate_by,
+        )
+
+    def get_facets(self, f):
+        """
+        Returns the facet counts of the filter results, cached like the
+        result pages but independent of the requested page.
+        """
+        if not self.search_cache_timeout:
+            return f.get_facets()
+        cache_key = make_cache_key(
+            "facets",
+            self.request.LANGUAGE_CODE,
+            normalize_query(self.request.GET, keys=f.filters, fold_case=True),
+        )
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = f.get_facets()
+            cache.set(cache_key, facets, self.search_cache_timeout)
+        return facets
+
+    def get_card_cache_key(self, decision, paragraph=None):
+        return make_fragment_cache_key(
+            "card",
+            decision,
+            self.request.LANGUAGE_CODE,
+            self.show_incomplete_fields,
+            paragraph,
+            # Links of incomplete decisions carry the ids being worked on
+            self.request.GET.get("ids") if self.show_incomplete_fields else None,
+        )
+
+    def get_cards(self, ids, paragraphs):
+        """
+        Returns the rendered cards of the decisions with ``ids`` in order,
+        linking to the anchors in ``paragraphs`` where a search matched.
+        Cards are cached until their decision changes, only decisions
+        missing from the cache are loaded and rendered.
+        """
+        decisions = LegalDecision._base_manager.filter(id__in=ids).only(
+            "id", "updated_at"
+        )
+        keys = {
+            decision.id: self.get_card_cache_key(decision, paragraphs.get(decision.id))
+            for decision in decisions
+        }
+        cards = cache.get_many(keys.values())
+        missing = [pk for pk, key in keys.items() if key not in cards]
+        if missing:
+            rendered = {
+                keys[decision.id]: render_to_string(
+                    self.card_template_name,
+                    {
+                        "object": decision,
+                        "decision": decision,
+                        "show_incomplete_fields": self.show_incomplete_fields,
+                        "paragraph": paragraphs.get(decision.id),
+                        "request": self.request,
+                    },
+                )
+                for decision in self.get_decisions(missing)
+            }
+            cache.set_many(rendered, FRAGMENT_CACHE_TIMEOUT)
+            cards.update(rendered)
+        return [cards[keys[pk]] for pk in ids if keys.get(pk) in cards]
+
+    def get_list_queryset(self):
+        return LegalDecision.objects.for_list()
+
+    def get_decisions(self, ids):
+        qs = self.get_list_queryset().filter(id__in=ids)
+        decisions = {decision.id: decision for decision in qs}
+        return [decisions[pk] for pk in ids if pk in decisions]
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         f = LegalDecisionFilterSet(
             self.request.GET, queryset=self.get_filter_queryset(), request=self.request
         )
-        qs = f.qs
-        qs = qs.select_related("foi_lawsuit")
-        qs = qs.prefetch_related("foi_laws", "foi_court", "translations")
-
-        paginator = Paginator(qs, self.paginate_by)
-        page = self.request.GET.get("page")
-        paginated = paginator.get_page(page)
+        result = self.get_result_page(f)
+        # Cached pages and facets don't validate the form, but the selected
+        # filters need its cleaned data before facets remove empty fields
+        f.is_valid()
+        selected_filters = f.get_selected_filters()
+        f.apply_facets(self.get_facets(f), limit=self.facet_limit)
         ctx.update(
             {
                 "filter": f,
-                "result": paginated,
-                "selected_filters": f.get_selected_filters(),
+                "result": result,
+                "selected_filters": selected_filters,
                 "query_url": f.get_filter_url(),
+                "date_range_query": f.get_query_items(exclude=("date_from", "date_to")),
+                "show_incomplete_fields": self.show_incomplete_fields,
             }
         )
         return ctx
@@ -313,6 +517,20 @@ class LegalDecisionListView(ListView):
 
 class LegalDecisionIncompleteListView(PermissionRequiredMixin, LegalDecisionListView):
     permission_required = "froide_legalaction.change_legaldecision"
+    count_limit = None
+    facet_limit = None
+    page_cache_timeout = None
+    search_cache_timeout = None
+    show_incomplete_fields = True
+
+    def get_list_queryset(self):
+        # The missing information shown on the cards checks court and laws
+        return (
+            super()
+            .get_list_queryset()
+            .select_related("foi_court")
+            .prefetch_related("foi_laws")
+        )
 
     def get_filter_queryset(self):
         incomplete = LegalDecision.objects.all_incomplete()
@@ -321,11 +539,6 @@ class LegalDecisionIncompleteListView(PermissionRequiredMixin, LegalDecisionList
             return incomplete.filter(id__in=id_list)
         return incomplete
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context.update({"show_incomplete_fields": True})
-        return context
-
 
 class LegalDecisionCreateView(PermissionRequiredMixin, FormView):
     permission_required = "froide_legalaction.add_legaldecision"
@@ -340,10 +553,70 @@ class LegalDecisionCreateView(PermissionRequiredMixin, FormView):
         return redirect(self.object)
 
 
-class LegalDecisionDetailView(DetailView):
+@method_decorator(
+    condition(
+        etag_func=get_decision_detail_etag,
+        last_modified_func=get_decision_updated_at,
+    ),
+    name="get",
+)
+class LegalDecisionDetailView(AnonymousPageCacheMixin, DetailView):
     model = LegalDecision
     template_name = "froide_legalaction/legaldecision/detail.html"
 
+    def get_queryset(self):
+        return LegalDecision.objects.for_detail()
+
+    def get_initial_sections(self):
+        # Without JavaScript the placeholders link to the complete text
+        if self.request.GET.get("full"):
+            return None
+        return INITIAL_SECTIONS
+
+    def get_fulltext_context(self):
+        """
+        Returns the paragraphs of the first sections of the full text and
+        the table of contents entries of the sections loaded lazily.
+        """
+        language = self.object.get_display_language()
+        initial_sections = self.get_initial_sections()
+        paragraphs = LegalDecisionParagraph.objects.filter(
+            decision=self.object, language_code=language
+        )
+        lazy_sections = []
+        if initial_sections is not None:
+            paragraphs = paragraphs.filter(section__lt=initial_sections)
+            lazy_sections = [
+                entry
+                for entry in self.object.fulltext_toc
+                if entry.get("section", 0) >= initial_sections
+            ]
+        return {
+            "fulltext_language": language,
+            "fulltext_paragraphs": list(paragraphs.values_list("html", flat=True)),
+            "lazy_sections": lazy_sections,
+        }
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        if not self.object.foi_document:
+            ctx.update(self.get_fulltext_context())
+        return ctx
+
+
+@cache_control(public=True, max_age=SECTION_MAX_AGE)
+def legal_decision_section(request, pk, section):
+    paragraphs = list(
+        LegalDecisionParagraph.objects.filter(
+            decision_id=pk,
+            language_code=request.GET.get("language", request.LANGUAGE_CODE),
+            section=section,
+        ).values_list("html", flat=True)
+    )
+    if not paragraphs:
+        raise Http404
+    return HttpResponse("".join(paragraphs))
+
 
 class LegalDecisionIncompleteUpdateView(PermissionRequiredMixin, UpdateView):
     permission_required = "froide_legalaction.change_legaldecision"
@@ -390,6 +663,166 @@ class LegalDecisionIncompleteUpdateView(PermissionRequiredMixin, UpdateView):
         return context
 
 
+def legal_decision_autocomplete(request):
+    query = request.GET.get("q", "").strip()
+    if len(query) < 3:
+        return JsonResponse({"results": []})
+    matches = LegalDecision.objects.fuzzy_search(
+        query, request.LANGUAGE_CODE, limit=AUTOCOMPLETE_LIMIT
+    )
+    decisions = LegalDecision.objects.in_bulk([pk for pk, _similarity in matches])
+    results = []
+    for pk, _similarity in matches:
+        decision = decisions[pk]
+        results.append(
+            {
+                "id": decision.id,
+                "reference": decision.reference,
+                "ecli": decision.ecli,
+                "title": decision.title or decision.display_title,
+                "court": decision.display_court,
+                "url": decision.get_absolute_url(),
+            }
+        )
+    return JsonResponse({"results": results})
+
+
+def get_live_search_etag(request):
+    return make_cache_key(
+        "live-search",
+        request.LANGUAGE_CODE,
+        normalize_query(request.GET, keys=("q", "limit"), fold_case=True),
+    )
+
+
+@cache_control(public=True, max_age=LIVE_SEARCH_MAX_AGE)
+@condition(etag_func=get_live_search_etag)
+def legal_decision_live_search(request):
+    try:
+        limit = int(request.GET.get("limit", LIVE_SEARCH_LIMIT))
+    except ValueError:
+        limit = LIVE_SEARCH_LIMIT
+    limit = max(1, min(limit, LIVE_SEARCH_LIMIT))
+    cache_key = get_live_search_etag(request)
+    results = cache.get(cache_key)
+    if results is None:
+        results = []
+        search_string = LegalDecision.objects.get_prefix_search_string(
+            request.GET.get("q", "")
+        )
+        if search_string is not None:
+            translation = LegalDecisionTranslation.objects.filter(
+                master=OuterRef("pk")
+            ).order_by(
+                Case(When(language_code=request.LANGUAGE_CODE, then=0), default=1)
+            )
+            results = list(
+                LegalDecision.objects.search(
+                    LegalDecision.objects.all(),
+                    search_string,
+                    request.LANGUAGE_CODE,
+                    search_type="raw",
+                )
+                .annotate(
+                    title=Subquery(
+                        translation.values(
+                            name=Coalesce(NullIf("title", Value("")), "display_title")
+                        )[:1]
+                    ),
+                    court=Subquery(translation.values("display_court")[:1]),
+                )
+                .values("id", "title", "reference", "court", "date")[:limit]
+            )
+            paragraphs = LegalDecision.objects.get_matching_paragraphs(
+                [result["id"] for result in results],
+                search_string,
+                request.LANGUAGE_CODE,
+                search_type="raw",
+            )
+            for result in results:
+                result["paragraph"] = paragraphs.get(result["id"])
+        cache.set(cache_key, results, SEARCH_CACHE_TIMEOUT)
+    return JsonResponse({"results": results})
+
+
+def get_facet_search_etag(request, name):
+    return make_cache_key(
+        "facet-search",
+        request.LANGUAGE_CODE,
+        name,
+        normalize_query(request.GET, fold_case=True),
+    )
+
+
+@cache_control(public=True, max_age=LIVE_SEARCH_MAX_AGE)
+@condition(etag_func=get_facet_search_etag)
+def legal_decision_facet_search(request, name):
+    """
+    Values of a facet of the decision list beyond the ones rendered with
+    the list, filtered by ``q`` and paged by ``page``, with their counts
+    and the list URLs selecting them.
+    """
+    data = request.GET.copy()
+    query = data.pop("q", [""])[-1].strip()
+    try:
+        page = max(int(data.pop("page", ["1"])[-1]), 1)
+    except ValueError:
+        page = 1
+    f = LegalDecisionFilterSet(
+        data, queryset=LegalDecision.objects.all(), request=request
+    )
+    if name not in f.get_facet_expressions():
+        raise Http404
+    cache_key = get_facet_search_etag(request, name)
+    result = cache.get(cache_key)
+    if result is None:
+        values, has_more = f.search_facet(name, query=query, page=page)
+        base_query = f.get_filter_url(clear_field=name)
+        result = {
+            "results": [
+                {
+                    "value": value,
+                    "label": str(label),
+                    "count": count,
+                    "url": "?{}".format(
+                        get_option_query(
+                            base_query, name, f.get_option_values(name, value)
+                        )
+                    ),
+                }
+                for value, label, count in values
+            ],
+            "has_more": has_more,
+        }
+        cache.set(cache_key, result, SEARCH_CACHE_TIMEOUT)
+    return JsonResponse(result)
+
+
+@cache_control(public=True, max_age=EXPORT_MAX_AGE)
+def legal_decision_export(request):
+    """
+    Streams all decisions as NDJSON or CSV, given by ``format``. With
+    ``since`` only decisions modified at or after that time are included.
+    """
+    export_format = request.GET.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(_("Unknown export format."))
+    since = None
+    if request.GET.get("since"):
+        try:
+            since = parse_since(request.GET["since"])
+        except ValueError:
+            return HttpResponseBadRequest(_("Invalid since parameter."))
+    response = StreamingHttpResponse(
+        export_decisions(export_format, since=since),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response["Content-Disposition"] = "attachment; filename=legal-decisions.{}".format(
+        export_format
+    )
+    return response
+
+
 def lawsuit_event_calendar(request):
     instances = Instance.objects.get_last_three_months()
 
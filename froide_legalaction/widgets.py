@@ -1,43 +1,106 @@
 from django.db.models.fields import BLANK_CHOICE_DASH
 from django.utils.encoding import force_str
+from django.utils.html import conditional_escape, format_html
 from django.utils.http import urlencode
-from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
 
 from django_filters.widgets import LinkWidget
 
+from .pagination import PAGE_PARAMETERS
+
+
+def get_option_query(base_query, name, value):
+    return "&".join(filter(None, [base_query, urlencode({name: value}, doseq=True)]))
+
 
 class ExcludePageParameterLinkWidget(LinkWidget):
+    # Links of widgets selecting multiple values toggle their value
+    allow_multiple_selected = False
+
+    def value_from_datadict(self, data, files, name):
+        if not self.allow_multiple_selected:
+            return super().value_from_datadict(data, files, name)
+        self.data = data
+        try:
+            return data.getlist(name)
+        except AttributeError:
+            return data.get(name)
+
+    def render(self, name, value, attrs=None, choices=(), renderer=None):
+        self.base_query = self.get_base_query(name)
+        return super().render(name, value, attrs, choices, renderer)
+
+    def get_base_query(self, name):
+        """
+        Query string of the current filters without page parameters and
+        this widget's own value, built once instead of once per option.
+        """
+        data = getattr(self, "data", {}).copy()
+        for parameter in PAGE_PARAMETERS + (name,):
+            data.pop(parameter, None)
+        try:
+            return data.urlencode()
+        except AttributeError:
+            return urlencode(data)
+
+    def render_options(self, choices, selected_choices, name):
+        if self.allow_multiple_selected:
+            # LinkWidget wraps the value in a list, unpack the selected values
+            selected_choices = [
+                value
+                for values in selected_choices
+                for value in (values if isinstance(values, list) else [values])
+                if value
+            ]
+        return super().render_options(choices, selected_choices, name)
+
     def render_option(self, name, selected_choices, option_value, option_label):
         option_value = force_str(option_value)
         if option_label == BLANK_CHOICE_DASH[0][1]:
             option_label = _("All")
-        data = self.data.copy()
-        if "page" in data:
-            del data["page"]
-        data[name] = option_value
-        selected = data == self.data or option_value in selected_choices
-        try:
-            url = data.urlencode()
-        except AttributeError:
-            url = urlencode(data)
+        if not self.allow_multiple_selected:
+            selected = option_value in selected_choices
+            value = option_value
+        elif not option_value:
+            selected = not selected_choices
+            value = []
+        else:
+            selected = option_value in selected_choices
+            value = sorted(selected_choices - {option_value})
+            if not selected:
+                value.append(option_value)
         return self.option_string() % {
             "attrs": selected and ' class="selected"' or "",
-            "query_string": url,
-            "label": force_str(option_label),
+            "query_string": get_option_query(self.base_query, name, value),
+            "label": conditional_escape(option_label),
         }
 
 
-class FilterListWidget(ExcludePageParameterLinkWidget):
+class MultipleLinkWidget(ExcludePageParameterLinkWidget):
+    allow_multiple_selected = True
+
+
+class FilterListWidget(MultipleLinkWidget):
+    # Set when only the top values are rendered, the list then searches
+    # and pages through the other values with this URL
+    search_url = None
+
     class Media:
         extend = False
         js = ("js/legal_decisions_listfilter.js",)
 
     def render(self, name, value, attrs=None, choices=(), renderer=None):
         output = super().render(name, value, attrs, choices, renderer)
-        search_field = mark_safe(
-            '<div class="list-filter"><input type="text" placeholder={} class="form-control form-control-sm list-filter__search">{}</div>'.format(
-                _("search"), output
+        if not self.search_url:
+            return format_html(
+                '<div class="list-filter"><input type="text" placeholder="{}" class="form-control form-control-sm list-filter__search">{}</div>',
+                _("search"),
+                output,
             )
+        return format_html(
+            '<div class="list-filter" data-search-url="{}"><input type="text" placeholder="{}" class="form-control form-control-sm list-filter__search">{}<button type="button" class="btn btn-link btn-sm list-filter__more">{}</button></div>',
+            self.search_url,
+            _("search"),
+            output,
+            _("more"),
         )
-        return search_field
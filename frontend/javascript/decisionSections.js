@@ -0,0 +1,39 @@
+window.addEventListener('load', () => {
+  const sections = Array.from(
+    document.querySelectorAll('.decision-section[data-url]')
+  )
+
+  const loadSection = async (section) => {
+    if (!section.isConnected) return
+    observer.unobserve(section)
+    const response = await fetch(section.dataset.url)
+    if (response.ok) {
+      section.outerHTML = await response.text()
+    }
+  }
+
+  const observer = new IntersectionObserver(
+    (entries) => {
+      for (const entry of entries) {
+        if (entry.isIntersecting) loadSection(entry.target)
+      }
+    },
+    { rootMargin: '500px' }
+  )
+  sections.forEach((section) => observer.observe(section))
+
+  // search results link to paragraphs that may not be loaded yet
+  const showHash = async () => {
+    const id = decodeURIComponent(window.location.hash.slice(1))
+    if (!id || document.getElementById(id)) return
+    for (const section of sections) {
+      await loadSection(section)
+      const target = document.getElementById(id)
+      if (target) {
+        target.scrollIntoView()
+        return
+      }
+    }
+  }
+  showHash()
+})
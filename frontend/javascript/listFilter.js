@@ -1,11 +1,16 @@
 window.addEventListener('load', () => {
   const listFilters = document.querySelectorAll('.list-filter__search')
   for (const filterInput of Array.from(listFilters)) {
-    const list = filterInput.parentElement.querySelector('ul')
-    filterInput.addEventListener('input', (e) => {
-      const filterValue = e.target.value
-      filterList(list, filterValue)
-    })
+    const container = filterInput.parentElement
+    const list = container.querySelector('ul')
+    if (container.dataset.searchUrl) {
+      setupFacetSearch(container, filterInput, list)
+    } else {
+      filterInput.addEventListener('input', (e) => {
+        const filterValue = e.target.value
+        filterList(list, filterValue)
+      })
+    }
   }
 })
 
@@ -19,3 +24,39 @@ function filterList(list, value) {
     }
   }
 }
+
+// Lists showing only the top values search and page through the rest
+function setupFacetSearch(container, filterInput, list) {
+  const moreButton = container.querySelector('.list-filter__more')
+  let page = 1
+  let timeout = null
+
+  const loadPage = async (append) => {
+    const params = new URLSearchParams({ q: filterInput.value, page })
+    const response = await fetch(`${container.dataset.searchUrl}&${params}`)
+    if (!response.ok) return
+    const data = await response.json()
+    if (!append) list.replaceChildren()
+    for (const facet of data.results) {
+      const entry = document.createElement('li')
+      const link = document.createElement('a')
+      link.href = facet.url
+      link.textContent = `${facet.label} (${facet.count})`
+      entry.append(link)
+      list.append(entry)
+    }
+    moreButton.hidden = !data.has_more
+  }
+
+  filterInput.addEventListener('input', () => {
+    clearTimeout(timeout)
+    timeout = setTimeout(() => {
+      page = 1
+      loadPage(false)
+    }, 250)
+  })
+  moreButton.addEventListener('click', () => {
+    page += 1
+    loadPage(true)
+  })
+}